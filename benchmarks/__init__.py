@@ -0,0 +1,22 @@
+# -*- coding: utf-8 -*-
+
+"""
+Benchmarks of pinvl validators.
+
+Run all of them, or the ones whose names contain any of the given words,
+from the repository root::
+
+    python -m benchmarks
+    python -m benchmarks Dict List --json results.json
+    python -m benchmarks --compare results.json
+
+Each case times `check()` of one validator on one value and reports calls
+per second, time per call and memory allocated by a call (peak of
+tracemalloc). With `--compare` cases which became slower than the saved
+results by more than `--threshold` are reported and the exit code is 1.
+
+With `--memory` it builds a thousand copies of each schema instead and
+reports the memory one of them takes::
+
+    python -m benchmarks --memory
+"""
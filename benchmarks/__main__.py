@@ -0,0 +1,123 @@
+# -*- coding: utf-8 -*-
+
+import argparse
+import json
+import sys
+import timeit
+import tracemalloc
+
+from .cases import all_cases, schemas
+
+
+def measure(case, min_time):
+    function = case.function()
+    timer = timeit.Timer(function)
+    number, _ = timer.autorange()
+    repeat = max(3, int(min_time / 0.2))
+    best = min(timer.repeat(repeat=repeat, number=number)) / number
+
+    tracemalloc.start()
+    function()  # warm up caches first
+    tracemalloc.stop()
+    tracemalloc.start()
+    function()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return {"seconds": best, "calls_per_second": 1 / best, "peak_bytes": peak}
+
+
+def measure_memory(factory, count=1000):
+    factory()  # warm up caches first
+    tracemalloc.start()
+    schemas = [factory() for _ in range(count)]
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del schemas
+
+    return {"bytes": size // count}
+
+
+def timing(args, baseline):
+    cases = [case for case in all_cases() if not args.filters or any(f in case.name for f in args.filters)]
+    results = {}
+    regressions = []
+
+    print("{0:<32} {1:>14} {2:>12} {3:>12}".format("case", "calls/s", "us/call", "peak bytes"))
+
+    for case in cases:
+        result = results[case.name] = measure(case, args.min_time)
+        line = "{0:<32} {1:>14,.0f} {2:>12.2f} {3:>12,}".format(
+            case.name, result["calls_per_second"], result["seconds"] * 1e6, result["peak_bytes"])
+
+        if "seconds" in baseline.get(case.name, ()):
+            change = result["seconds"] / baseline[case.name]["seconds"] - 1
+            line += " {0:>+8.1%}".format(change)
+
+            if change > args.threshold:
+                regressions.append(case.name)
+
+        print(line)
+
+    return results, regressions
+
+
+def memory(args, baseline):
+    results = {}
+    regressions = []
+
+    print("{0:<32} {1:>14}".format("schema", "bytes"))
+
+    for name, factory in schemas():
+        if args.filters and not any(f in name for f in args.filters):
+            continue
+
+        result = results[name] = measure_memory(factory)
+        line = "{0:<32} {1:>14,}".format(name, result["bytes"])
+
+        if "bytes" in baseline.get(name, ()):
+            change = float(result["bytes"]) / baseline[name]["bytes"] - 1
+            line += " {0:>+8.1%}".format(change)
+
+            if change > args.threshold:
+                regressions.append(name)
+
+        print(line)
+
+    return results, regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m benchmarks", description=__doc__)
+    parser.add_argument("filters", nargs="*", help="run cases whose names contain any of these")
+    parser.add_argument("--min-time", type=float, default=1.0, help="seconds to spend per case")
+    parser.add_argument("--json", help="save results to file")
+    parser.add_argument("--compare", help="compare with results saved by --json")
+    parser.add_argument("--threshold", type=float, default=0.1, help="slowdown to report, 0.1 is 10%%")
+    parser.add_argument("--memory", action="store_true", help="measure memory taken by built schemas instead")
+    args = parser.parse_args(argv)
+
+    baseline = {}
+
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+
+    if args.memory:
+        results, regressions = memory(args, baseline)
+    else:
+        results, regressions = timing(args, baseline)
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(results, f, indent=2, sort_keys=True)
+
+    if regressions:
+        print("\nworse than baseline: {0}".format(", ".join(regressions)))
+        return 1
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,202 @@
+# -*- coding: utf-8 -*-
+
+"""
+Benchmark cases: every primitive and container validator, valid and
+invalid inputs, containers at several sizes.
+"""
+
+from decimal import Decimal
+from fractions import Fraction
+
+from pinvl import *
+from pinvl._compat import Undefined
+
+
+SIZES = (10, 1000)
+
+
+class Case(object):
+
+    """
+    Times `validator.check(value)`. Invalid values are expected to raise
+    DataError, valid ones not to.
+    """
+
+    def __init__(self, name, validator, value, valid=True):
+        self.name = "{0}[{1}]".format(name, "valid" if valid else "invalid")
+        self.validator = validator
+        self.value = value
+        self.valid = valid
+
+    def function(self):
+        check = self.validator.check
+        value = self.value
+
+        if self.valid:
+            return lambda: check(value)
+
+        def run():
+            try:
+                check(value)
+            except DataError:
+                return
+
+            raise AssertionError("{0} accepted invalid value".format(self.name))
+
+        return run
+
+
+class FloatPathInt(Int):
+
+    """
+    Int which converts through float, as Int did before exact conversion,
+    the baseline of the "Int:float-path" cases.
+    """
+
+    __slots__ = ()
+
+    def _parse(self, value):
+        if isinstance(value, int):
+            return value
+
+        if not isinstance(value, self._convertable):
+            return Undefined
+
+        try:
+            value = float(value)
+        except (ValueError, OverflowError):
+            return Undefined
+
+        return int(value) if value.is_integer() else Undefined
+
+
+def primitives():
+    yield Case("Int", Int(), 123)
+    yield Case("Int:str", Int(), "123")
+    yield Case("Int:str:float", Int(), "5.0")
+    yield Case("Int:str:id", Int(), "9007199254740993")
+    yield Case("Int:float", Int(), 5.0)
+    yield Case("Int:Fraction", Int(), Fraction(10, 2))
+    yield Case("Int:Decimal", Int(), Decimal("5"))
+    yield Case("Int:strict", Int(strict=True), 123)
+    yield Case("Int:float-path", FloatPathInt(), 123)
+    yield Case("Int:float-path:str", FloatPathInt(), "123")
+    yield Case("Int:float-path:str:float", FloatPathInt(), "5.0")
+    yield Case("Int:float-path:float", FloatPathInt(), 5.0)
+    yield Case("Int:float-path", FloatPathInt(), "x", valid=False)
+    yield Case("Int", Int(), "x", valid=False)
+    yield Case("Int:str:float", Int(), "1.5", valid=False)
+    yield Case("Int[0:100]", Int[0:100], 500, valid=False)
+    yield Case("Float", Float(), 1.5)
+    yield Case("Float:str", Float(), "1.5")
+    yield Case("Float:Decimal", Float(), Decimal("1.5"))
+    yield Case("Float", Float(), "x", valid=False)
+    yield Case("String", String(), "hello")
+    yield Case("String", String(), 1, valid=False)
+    yield Case("String:regex", String(regex=r"^[a-z]+\d*$"), "hello42")
+    yield Case("String:regex", String(regex=r"^[a-z]+\d*$"), "Hello!", valid=False)
+    yield Case("Bool:convert", Bool(convert=True), "true")
+    yield Case("Bool:convert", Bool(convert=True), "maybe", valid=False)
+    yield Case("Enum", Enum(*["variant{0}".format(i) for i in range(20)]), "variant19")
+    yield Case("Enum", Enum(*["variant{0}".format(i) for i in range(20)]), "other", valid=False)
+    yield Case("Enum:codes", Enum(*["C{0:04d}".format(i) for i in range(5000)]), "C4999")
+    yield Case("Enum:codes:ignore_case", Enum(*["C{0:04d}".format(i) for i in range(5000)], ignore_case=True), "c4999")
+    yield Case("Atom", Atom("atom"), "atom")
+    yield Case("Atom", Atom("atom"), "other", valid=False)
+    yield Case("DateTime", DateTime(), "2017-05-12T10:20:30.5+03:00")
+    yield Case("DateTime", DateTime(), "2017-05-12 10:20", valid=False)
+    yield Case("Email", Email(), "someone@example.net")
+    yield Case("Email:idna", Email(), u"someone@пример.рф")
+    yield Case("Email", Email(), "spam" * 50, valid=False)
+    yield Case("URL", URL(), "http://example.net/resource/?param=value#anchor")
+    yield Case("URL:idna", URL(), u"http://пример.рф/resource/?param=value#anchor")
+    yield Case("URL", URL(), "spam" * 50, valid=False)
+
+
+def record():
+    return Dict(id=Int, name=String, email=String(regex=r"^[^@]+@[^@]+$"),
+                score=Float[0:1] | Null, tags=List(String), active=Bool)
+
+
+def record_value(index):
+    return {"id": index, "name": "user{0}".format(index), "email": "user{0}@example.net".format(index),
+            "score": 0.5, "tags": ["a", "b"], "active": True}
+
+
+def containers():
+    for size in SIZES:
+        items = list(range(size))
+        yield Case("List(Int)/{0}".format(size), List(Int), items)
+        yield Case("List(Int)/{0}".format(size), List(Int), items[:-1] + ["x"], valid=False)
+
+        rows = [record_value(i) for i in range(size)]
+        bad_rows = rows[:-1] + [dict(rows[-1], email="nobody")]
+        yield Case("List(Dict)/{0}".format(size), List(record()), rows)
+        yield Case("List(Dict)/{0}".format(size), List(record()), bad_rows, valid=False)
+
+        mapping = dict(("key{0}".format(i), i) for i in range(size))
+        yield Case("Mapping/{0}".format(size), Mapping(String, Int), mapping)
+        yield Case("Mapping/{0}".format(size), Mapping(String, Int), dict(mapping, bad="x"), valid=False)
+
+        yield Case("Dict:soft/{0}".format(size), Dict({String: Int}), mapping)
+        yield Case("Dict:soft/{0}".format(size), Dict({String: Int}), dict(mapping, bad="x"), valid=False)
+
+    yield Case("Tuple", Tuple(Int, String, Float), (1, "a", 1.5))
+    yield Case("Tuple", Tuple(Int, String, Float), (1, "a", "b"), valid=False)
+    yield Case("Dict", record(), record_value(1))
+    yield Case("Dict", record(), dict(record_value(1), id="x"), valid=False)
+    yield Case("Dict:extra", record(), dict(record_value(1), extra=1), valid=False)
+
+    wide = Dict(dict(("key{0}".format(i), Int) for i in range(30)))
+    yield Case("Dict:30keys", wide, dict(("key{0}".format(i), i) for i in range(30)))
+
+    variants = Int | Float | Null | String
+    yield Case("Or", variants, "last")
+    yield Case("Or", variants, [], valid=False)
+
+    versions = [Dict(version=Atom(i), payload=record()) for i in range(1, 9)]
+    message = {"version": 8, "payload": record_value(1)}
+    yield Case("Or:versions", Or(*versions), message)
+    yield Case("Or:versions:adaptive", Or(*versions, adaptive=True), message)
+
+    node = Forward()
+    node << Dict(name=String, children=List(node))
+    yield Case("Forward", node, tree(6, 2))
+    yield Case("Forward", node, tree(6, 2, leaf={"name": 1, "children": []}), valid=False)
+
+
+def tree(depth, width, leaf=None):
+    if not depth:
+        return leaf or {"name": "leaf", "children": []}
+
+    return {"name": "node", "children": [tree(depth - 1, width, leaf) for _ in range(width)]}
+
+
+def all_cases():
+    return list(primitives()) + list(containers())
+
+
+def tenant_schema():
+    address = Dict(street=String, city=String, zip=String(regex=r"^\d{5}$"), country=Enum("us", "ca", "mx"))
+    user = Dict({
+        "id": Int[1:],
+        "email": String(regex=r"^[^@]+@[^@]+$"),
+        "name": String,
+        "age": Int[0:150] | Null,
+        "score": Float[0:1],
+        "roles": List(Enum("admin", "user", "guest"), max_length=3),
+        "address": address,
+        "location": Tuple(Float, Float),
+        Key("tags", optional=True): Mapping(String, String),
+    })
+
+    return Dict(tenant=String, users=List(user), active=Bool, version=Atom(2))
+
+
+def schemas():
+    """
+    Factories of schemas which memory benchmarks build many copies of.
+    """
+    yield "Dict:record", record
+    yield "Dict:tenant", tenant_schema
+    yield "Or:versions", lambda: Or(*[Dict(version=Atom(i), payload=record()) for i in range(1, 9)])
@@ -6,6 +6,7 @@ to validate complex data structures. Look at class docs for usage examples.
 """
 
 import sys
+from importlib import import_module
 from .validators import *
 from .validators import __all__ as __validators_all__
 
@@ -18,17 +19,101 @@ __all__ = list(__validators_all__)
 
 ENTRY_POINT = "pinvl"
 
+# Contrib validators are imported on first access: name -> (module, module
+# which must be installed for it).
+CONTRIB = {
+    "URL": ("pinvl.contrib.url", None),
+    "Email": ("pinvl.contrib.email", None),
+    "DateTime": ("pinvl.contrib.rfc_3339", None),
+    "MongoId": ("pinvl.contrib.object_id", "bson"),
+}
 
-def _load_contrib():
-    from pkg_resources import iter_entry_points, DistributionNotFound
+_plugins = None
 
-    for entry_point in iter_entry_points(ENTRY_POINT):
+
+def _entry_points():
+    """
+    Validators registered by other distributions in "pinvl" entry points,
+    by name. They are looked up once, on the first miss of the contrib index.
+    """
+    global _plugins
+
+    if _plugins is None:
         try:
-            cls = entry_point.load()
-        except (ImportError, DistributionNotFound):
-            continue
+            from importlib.metadata import entry_points
+        except ImportError:
+            from pkg_resources import iter_entry_points
+            found = iter_entry_points(ENTRY_POINT)
+        else:
+            try:
+                found = entry_points(group=ENTRY_POINT)
+            except TypeError:  # python < 3.10
+                found = entry_points().get(ENTRY_POINT, ())
+
+        _plugins = dict((entry_point.name.lstrip("."), entry_point) for entry_point in found)
+
+    return _plugins
+
+
+def _available(requirement):
+    if requirement is None:
+        return True
+
+    try:
+        from importlib.util import find_spec
+    except ImportError:
+        return True
+
+    return find_spec(requirement) is not None
+
+
+def _load(name):
+    """
+    Imports contrib or plugin validator, raises AttributeError if there is
+    no such validator or its requirements are not installed.
+    """
+    try:
+        if name in CONTRIB:
+            cls = getattr(import_module(CONTRIB[name][0]), name)
+        elif name in _entry_points():
+            cls = _entry_points()[name].load()
+        else:
+            cls = None
+    except ImportError as err:
+        raise AttributeError("{0} is not available: {1}".format(name, err))
+
+    if cls is None:
+        raise AttributeError("module {0!r} has no attribute {1!r}".format(__name__, name))
 
-        setattr(sys.modules[__name__], cls.__name__, cls)
-        __all__.append(cls.__name__)
+    setattr(sys.modules[__name__], name, cls)
+
+    return cls
+
+
+def __getattr__(name):
+    if name.startswith("__"):
+        raise AttributeError("module {0!r} has no attribute {1!r}".format(__name__, name))
+
+    return _load(name)
+
+
+def __dir__():
+    return sorted(set(globals()) | set(name for name, (_, requirement) in CONTRIB.items()
+                                       if _available(requirement)))
+
+
+# "import *" imports the contrib modules through __getattr__, plain
+# "import pinvl" doesn't
+__all__.extend(name for name, (_, requirement) in sorted(CONTRIB.items()) if _available(requirement))
+
+
+if sys.version_info < (3, 7):
+    # no module __getattr__, everything is loaded on import
+    for _name in list(CONTRIB) + list(_entry_points()):
+        try:
+            _load(_name)
+        except AttributeError:
+            continue
 
-_load_contrib()
+        if _name not in __all__:
+            __all__.append(_name)
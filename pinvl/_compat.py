@@ -11,6 +11,8 @@ __all__ = (
     "implements_metaclass", "metaclass",
     "Undefined",
     "urlparse",
+    "RecursionError",
+    "ContextVar",
 )
 
 
@@ -107,7 +109,9 @@ def implements_metaclass(meta):
 
 
 def metaclass(meta):
-    return meta(_metaclass_container_name, (object, ), {})
+    # empty slots, so the container doesn't give __dict__ to instances of
+    # classes with __slots__
+    return meta(_metaclass_container_name, (object, ), {"__slots__": ()})
 
 
 # Undefined
@@ -133,3 +137,41 @@ if PY2:
 
 else:
     import urllib.parse as urlparse
+
+
+# RecursionError
+if PY2:
+    RecursionError = RuntimeError
+
+else:
+    from builtins import RecursionError
+
+
+# ContextVar
+try:
+    from contextvars import ContextVar
+
+except ImportError:  # before python 3.7
+    import threading
+
+    class ContextVar(object):
+
+        """
+        Thread-local stand-in for `contextvars.ContextVar`.
+        """
+
+        def __init__(self, name, default=None):
+            self.name = name
+            self.default = default
+            self.local = threading.local()
+
+        def get(self):
+            return getattr(self.local, "value", self.default)
+
+        def set(self, value):
+            token = self.get()
+            self.local.value = value
+            return token
+
+        def reset(self, token):
+            self.local.value = token
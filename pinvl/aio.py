@@ -0,0 +1,306 @@
+# -*- coding: utf-8 -*-
+
+"""
+Asynchronous validation, see `ValidatorBase.async_check`.
+
+Functions of `Call` and converters added with `>>` may be coroutine
+functions, or return any awaitable: it is awaited. Items of `List` and
+`Tuple`, pairs of `Mapping` and keys of `Dict` are checked concurrently,
+`Or` tries its variants one after another, `Cached` reads and fills its
+cache. Validators without async support (and subclasses which override
+`_check`) are checked as by `check` and only their converters are awaited.
+
+>>> import asyncio
+>>> from pinvl.validators import Call, Dict, Int
+>>> async def exists(value):
+...     return value
+>>> asyncio.run(Dict(id=Int >> exists).async_check({"id": "1"}))
+{'id': 1}
+"""
+
+import asyncio
+import inspect
+
+from .validators import DataError, Call, Cached, Dict, Forward, List, Mapping, Or, Tuple, _freeze
+from ._compat import *
+
+
+__all__ = ("async_check", )
+
+
+async def async_check(validator, value, concurrency=None):
+    """
+    Checks value with validator, at most `concurrency` awaitables returned
+    by validator functions are awaited at a time if it is given.
+    """
+    semaphore = asyncio.Semaphore(concurrency) if concurrency else None
+
+    return await _Checker(semaphore).check(validator, value)
+
+
+class _Checker(object):
+
+    def __init__(self, semaphore):
+        self.semaphore = semaphore
+
+    async def resolve(self, result):
+        if not inspect.isawaitable(result):
+            return result
+
+        if self.semaphore is None:
+            return await result
+
+        async with self.semaphore:
+            return await result
+
+    async def check(self, validator, value):
+        if _supports(validator, Call):
+            value = await self.resolve(validator.function(value))
+
+        elif _supports(validator, List):
+            value = await self.check_list(validator, value)
+
+        elif _supports(validator, Tuple):
+            value = await self.check_tuple(validator, value)
+
+        elif _supports(validator, Dict) and validator._simple_keys:
+            value = await self.check_dict(validator, value)
+
+        elif _supports(validator, Mapping):
+            value = await self.check_mapping(validator, value)
+
+        elif _supports(validator, Or):
+            value = await self.check_or(validator, value)
+
+        elif _supports(validator, Forward) and validator.validator is not None:
+            value = await self.check(validator.validator, value)
+
+        elif _supports(validator, Cached):
+            value = await self.check_cached(validator, value)
+
+        else:
+            value = validator._check(value)
+
+        if validator._converters:
+            for converter in validator._converters:
+                value = await self.resolve(converter(value))
+
+            return value
+
+        return validator._converter_default(value)
+
+    async def capture(self, validator, value):
+        """
+        Checks value, returns DataError instead of raising it, so checks
+        can be gathered.
+        """
+        try:
+            return await self.check(validator, value)
+        except DataError as err:
+            return err
+
+    async def gather(self, pairs):
+        """
+        Checks (validator, value) pairs concurrently, returns list of
+        results and {position: DataError} dict.
+        """
+        results = await asyncio.gather(*[self.capture(validator, value) for validator, value in pairs])
+        errors = dict((index, result) for index, result in enumerate(results) if isinstance(result, DataError))
+
+        return results, errors
+
+    async def check_list(self, validator, value):
+        if not isinstance(value, list):
+            raise DataError(code="not_list")
+
+        if len(value) < validator.min_length:
+            raise DataError(code="min_length", params=(validator.min_length, ))
+
+        if validator.max_length is not None and len(value) > validator.max_length:
+            raise DataError(code="max_length", params=(validator.max_length, ))
+
+        results, errors = await self.gather([(validator.validator, item) for item in value])
+
+        if errors:
+            raise DataError(errors)
+
+        return results
+
+    async def check_tuple(self, validator, value):
+        try:
+            value = tuple(value)
+        except TypeError:
+            raise DataError(code="not_tuple")
+
+        if len(value) != len(validator.validators):
+            raise DataError(code="tuple_length", params=(len(validator.validators), ))
+
+        results, errors = await self.gather(zip(validator.validators, value))
+
+        if errors:
+            raise DataError(errors)
+
+        return tuple(results)
+
+    async def check_mapping(self, validator, value):
+        items = list(iteritems(value))
+        pairs = []
+
+        for key, item in items:
+            pairs.append((validator.validator_key, key))
+            pairs.append((validator.validator_value, item))
+
+        results, failed = await self.gather(pairs)
+        checked = {}
+        errors = {}
+
+        for index, (key, item) in enumerate(items):
+            pair_errors = {}
+
+            if 2 * index in failed:
+                pair_errors["key"] = failed[2 * index]
+
+            if 2 * index + 1 in failed:
+                pair_errors["value"] = failed[2 * index + 1]
+
+            if pair_errors:
+                errors[key] = DataError(pair_errors)
+            else:
+                checked[results[2 * index]] = results[2 * index + 1]
+
+        if errors:
+            raise DataError(errors)
+
+        return checked
+
+    async def check_cached(self, validator, value):
+        try:
+            key = (False, _freeze(value))
+        except TypeError:
+            return await self.check(validator.validator, value)
+
+        memo = validator._memo
+        now, entry = memo.get(key)
+
+        if entry is not None:
+            return memo.replay(entry)
+
+        try:
+            result = await self.check(validator.validator, value)
+        except DataError as err:
+            memo.store(key, now, None, err)
+            raise
+
+        memo.store(key, now, result, None)
+
+        return result
+
+    async def check_or(self, validator, value):
+        errors = []
+
+        for variant in validator.validators:
+            try:
+                return await self.check(variant, value)
+            except DataError as err:
+                errors.append((variant, err))
+
+        raise DataError(code="variants", params=(errors, ))
+
+    async def check_dict(self, validator, value):
+        if not isinstance(value, dict):
+            raise DataError(code="not_dict")
+
+        names = []
+        pairs = []
+        errors = {}
+        present = 0
+
+        for key in validator._hard_keys:
+            if key.name in value:
+                present += 1
+                item = value[key.name]
+
+            elif key.optional:
+                continue
+
+            elif key.default is not Undefined:
+                item = key.default() if callable(key.default) else key.default
+
+            else:
+                errors[key.name] = DataError(code="required")
+                continue
+
+            names.append(key.to_name or key.name)
+            pairs.append((key.validator, item))
+
+        results, failed = await self.gather(pairs)
+        collect = {}
+
+        for index, name in enumerate(names):
+            if index in failed:
+                errors[name] = failed[index]
+            else:
+                collect[name] = results[index]
+
+        if present != len(value):
+            await self.check_extra(validator, value, collect, errors)
+
+        if errors:
+            raise DataError(errors)
+
+        return collect
+
+    async def check_extra(self, validator, value, collect, errors):
+        """
+        Checks keys which are not hard keys of Dict against its soft keys,
+        as `Dict._check_extra` does.
+        """
+        for k, v in iteritems(value):
+            if k in validator._hard_names:
+                continue
+
+            if not validator._soft_keys:
+                errors[k] = DataError(code="not_allowed", params=(k, ))
+                continue
+
+            failed = {}
+
+            for mapping in validator._soft_candidates(k):
+                try:
+                    collect.update(await self.check(mapping, {k: v}))
+                except DataError as err:
+                    failed[mapping] = err.error[k]
+                    continue
+
+                break
+
+            else:
+                errors[k] = await self.soft_error(validator, k, v, failed)
+
+    async def soft_error(self, validator, k, v, failed):
+        """
+        Error of a key which no soft key accepts, as `Dict._soft_error`
+        builds it, with errors of the soft keys tried already in `failed`.
+        """
+        item_errors = []
+
+        for mapping in validator._soft_keys:
+            if mapping not in failed:
+                try:
+                    await self.check(mapping, {k: v})
+                except DataError as err:
+                    failed[mapping] = err.error[k]
+                else:
+                    continue
+
+            item_errors.append((mapping, failed[mapping]))
+
+        return DataError(code="variants", params=(item_errors, ))
+
+
+def _supports(validator, cls):
+    """
+    Checks if validator is an instance of cls which checks values as cls
+    does, so it can be checked asynchronously.
+    """
+    return isinstance(validator, cls) and not validator._overrides(cls, "_check")
@@ -0,0 +1,351 @@
+# -*- coding: utf-8 -*-
+
+"""
+Batch validation of homogeneous collections.
+
+`List.check_batch` checks a whole list, tuple or array at once and returns
+the checked items together with the errors of the failed ones, instead of
+raising on the first bad item. When NumPy is installed and items are
+checked by plain `Int` or `Float`, type checks, conversion and bounds run
+as vectorized array operations; other validators are applied item by item.
+Records checked by `Dict` are pivoted into columns, one per key, and each
+column is checked at once, so nested numeric fields are vectorized too.
+`Dict.check_columns` takes such columns as they are.
+
+>>> from pinvl.validators import List, Int
+>>> result, errors = List(Int[0:100]).check_batch([1, "2", 300])
+>>> result
+[1, 2]
+>>> errors
+{2: DataError(value is greater than 100)}
+"""
+
+from operator import itemgetter
+
+from .validators import DataError, Dict, Float, Int
+from ._compat import *
+
+try:
+    import numpy
+except ImportError:  # numpy is optional
+    numpy = None
+
+
+__all__ = ("check_column", "check_columns", "check_items", "check_list")
+
+
+def check_list(validator, value):
+    """
+    Batch counterpart of `List._check`, see `List.check_batch`.
+    """
+    if numpy is not None and isinstance(value, numpy.ndarray):
+        length = value.shape[0] if value.ndim else 0
+
+        if not value.ndim:
+            raise DataError(code="not_list")
+
+    elif isinstance(value, (list, tuple)):
+        length = len(value)
+
+    else:
+        raise DataError(code="not_list")
+
+    if length < validator.min_length:
+        raise DataError(code="min_length", params=(validator.min_length, ))
+
+    if validator.max_length is not None and length > validator.max_length:
+        raise DataError(code="max_length", params=(validator.max_length, ))
+
+    return check_items(validator.validator, value)
+
+
+def check_items(validator, items):
+    """
+    Check every item of sequence or array with validator. Returns checked
+    items which passed, in order, and {index: DataError} dict of failed
+    ones. The checked items are a NumPy array if value is an array and
+    vectorized check was possible, a list otherwise.
+    """
+    column, errors = check_column(validator, items)
+
+    if errors:
+        column = _drop(column, errors)
+
+    return _like(column, items), errors
+
+
+def check_columns(validator, columns):
+    """
+    Batch counterpart of `Dict._check` for dict of columns, see
+    `Dict.check_columns`.
+    """
+    if not isinstance(columns, dict):
+        raise DataError(code="not_dict")
+
+    names = list(columns)
+    length = len(columns[names[0]]) if names else 0
+
+    for name in names:
+        if len(columns[name]) != length:
+            raise DataError({name: DataError(code="column_length", params=(names[0], ))})
+
+    if _columnar(validator) and _covers(validator, columns):
+        result, errors = _check_columns(validator, columns, length)
+
+    else:
+        rows = [dict(zip(names, values)) for values in zip(*(_items(columns[name]) for name in names))]
+        rows, errors = check_column(validator, rows)
+        result = {}
+
+        for index, row in enumerate(rows):
+            if index not in errors:
+                for name in row:
+                    result.setdefault(name, [None] * length)[index] = row[name]
+
+    if errors:
+        result = dict((name, _drop(column, errors)) for name, column in iteritems(result))
+
+    return result, errors
+
+
+def check_column(validator, items):
+    """
+    Like `check_items`, but checked items keep their places: failed ones
+    are replaced with placeholders, so columns of one batch stay aligned.
+    """
+    if _vectorizable(validator, items):
+        checked = _check_array(validator, items)
+
+        if checked is not None:
+            return checked
+
+    items = _items(items)
+
+    if _columnar(validator):
+        return _check_records(validator, items)
+
+    column = []
+    errors = {}
+    check = validator.check
+
+    for index, item in enumerate(items):
+        try:
+            column.append(check(item))
+        except DataError as err:
+            column.append(None)
+            errors[index] = err
+
+    return column, errors
+
+
+def _items(items):
+    if numpy is not None and isinstance(items, numpy.ndarray):
+        return items.tolist()
+
+    return items
+
+
+def _like(column, items):
+    """
+    Checked column is an array only if items are.
+    """
+    if numpy is not None and isinstance(column, numpy.ndarray) and not isinstance(items, numpy.ndarray):
+        return column.tolist()
+
+    return column
+
+
+def _columnar(validator):
+    return validator.__class__ is Dict and validator._simple_keys and validator._hard_keys and \
+        not validator._converters
+
+
+def _check_records(validator, records):
+    """
+    Pivots records with exactly the hard keys of Dict validator into
+    columns and checks every column at once. Other records (missing or
+    extra keys, not dicts) are checked one by one.
+    """
+    keys = validator._hard_keys
+    count = len(keys)
+    getter = itemgetter(*[key.name for key in keys])
+
+    regular = []
+    rows = []
+    errors = {}
+    irregular = {}
+
+    for index, record in enumerate(records):
+        if isinstance(record, dict) and len(record) == count:
+            try:
+                values = getter(record)
+            except KeyError:
+                pass
+            else:
+                regular.append(index)
+                rows.append(values if count > 1 else (values, ))
+                continue
+
+        try:
+            irregular[index] = validator.check(record)
+        except DataError as err:
+            errors[index] = err
+
+    names = [key.to_name or key.name for key in keys]
+    columns = []
+    row_errors = {}
+
+    for name, key, column in zip(names, keys, zip(*rows)):
+        checked, failed = check_column(key.validator, column)
+        columns.append(_items(checked))
+
+        for position, err in iteritems(failed):
+            row_errors.setdefault(regular[position], {})[name] = err
+
+    for index, err in iteritems(row_errors):
+        errors[index] = DataError(err)
+
+    result = [None] * len(records)
+
+    for index, values in zip(regular, zip(*columns)):
+        if index not in errors:
+            result[index] = dict(zip(names, values))
+
+    for index, value in iteritems(irregular):
+        result[index] = value
+
+    return result, errors
+
+
+def _check_columns(validator, columns, length):
+    """
+    Checks every column by its key, columns must cover the required keys.
+    """
+    result = {}
+    errors = {}
+
+    for key in validator._hard_keys:
+        name = key.to_name or key.name
+
+        if key.name in columns:
+            column = columns[key.name]
+
+        elif key.optional:
+            continue
+
+        else:
+            column = [key.default() if callable(key.default) else key.default for _ in range(length)]
+
+        checked, failed = check_column(key.validator, column)
+        result[name] = _like(checked, column)
+
+        for index, err in iteritems(failed):
+            errors.setdefault(index, {})[name] = err
+
+    return result, dict((index, DataError(err)) for index, err in iteritems(errors))
+
+
+def _covers(validator, columns):
+    """
+    Columns are all hard keys of Dict validator and include every required
+    key, otherwise rows are checked one by one to get the errors of `check`.
+    """
+    names = validator._hard_names
+
+    for name in columns:
+        if name not in names:
+            return False
+
+    for key in validator._hard_keys:
+        if key.name not in columns and not key.optional and key.default is Undefined:
+            return False
+
+    return True
+
+
+def _drop(column, errors):
+    """
+    Column without the failed rows.
+    """
+    if numpy is not None and isinstance(column, numpy.ndarray):
+        passed = numpy.ones(column.shape, dtype=bool)
+        passed[list(errors)] = False
+        return column[passed]
+
+    return [item for index, item in enumerate(column) if index not in errors]
+
+
+def _vectorizable(validator, items):
+    if numpy is None or validator.__class__ not in (Int, Float) or validator._converters or validator.strict:
+        return False
+
+    if not isinstance(items, numpy.ndarray):
+        return True
+
+    return items.ndim == 1
+
+
+def _check_array(validator, items):
+    """
+    Vectorized check of numeric array by Int or Float. Returns None if the
+    array can't be checked this way, so items are checked one by one.
+    """
+    try:
+        array = numpy.asarray(items)
+    except (TypeError, ValueError):  # ragged nested sequences
+        return None
+
+    if array.ndim != 1 or array.dtype.kind not in "iuf":
+        return None
+
+    if validator.__class__ is Int:
+        if not isinstance(items, numpy.ndarray) and any(item.__class__ is bool for item in items):
+            return None  # Int returns bools as they are, not as ints
+
+        if array.dtype.kind == "f":
+            if not isinstance(items, numpy.ndarray):
+                return None  # mixed Python ints and floats, ints may be too big for float
+
+            # integral values which fit int64, the rest is left to Int itself
+            passed = numpy.isfinite(array)
+            passed[passed] = (array[passed] == numpy.floor(array[passed])) & \
+                (numpy.abs(array[passed]) < 2 ** 63)
+
+        elif array.dtype.kind == "u":
+            # uint64 values above int64 would wrap, they are left to Int itself
+            passed = array <= numpy.iinfo(numpy.int64).max
+
+        else:
+            passed = numpy.ones(array.shape, dtype=bool)
+
+        converted = numpy.zeros(array.shape, dtype=numpy.int64)
+        converted[passed] = array[passed]
+
+    else:
+        passed = numpy.ones(array.shape, dtype=bool)
+        converted = array.astype(numpy.float64)
+
+    bounds = (
+        (validator.gte, numpy.less),
+        (validator.lte, numpy.greater),
+        (validator.lt, numpy.greater_equal),
+        (validator.gt, numpy.less_equal),
+    )
+
+    for bound, failed in bounds:
+        if bound is not None:
+            passed &= ~failed(converted, bound)
+
+    errors = {}
+
+    if not passed.all():
+        # failed items are checked once more to get exactly the same errors
+        for index in numpy.flatnonzero(~passed).tolist():
+            try:
+                validator.check(array[index].item())
+            except DataError as err:
+                errors[index] = err
+            else:
+                return None
+
+    return converted, errors
@@ -0,0 +1,463 @@
+# -*- coding: utf-8 -*-
+
+"""
+Schema compiler. Turns a finished validator tree into one specialized
+function, generated as Python source and built with `exec`.
+
+Constants, bounds, regular expressions and error codes are inlined, so
+the generated function does no per-node dispatch for the built-in
+validators. Nodes the compiler does not know (subclasses, contrib
+validators, `Dict` with soft keys or custom `Key` classes) are called
+through their own `check` method, so the result is always the same as
+calling `validator.check`.
+
+The tree is read once at compile time: changes made to it afterwards are
+not seen by the compiled function.
+
+>>> from pinvl.validators import Dict, Int, List, String, DataError
+>>> check = compile(Dict(foo=Int[1:], bar=List[String]))
+>>> check({"foo": 1, "bar": ["spam"]}) == {"foo": 1, "bar": ["spam"]}
+True
+>>> try:
+...     check({"foo": 0, "bar": []})
+... except DataError as error:
+...     error.as_dict()
+{'foo': 'value is less than 1'}
+"""
+
+import itertools
+import linecache
+from .validators import (ValidatorBase, DataError, Type, Any, Or, Null, Bool,
+                         Float, Int, Atom, String, List, Tuple, Dict,
+                         Mapping, Enum, Callable, Call, Forward)
+from ._compat import *
+
+
+__all__ = ("compile", )
+
+
+_builtin_compile = compile
+
+# numbers of builds, so the source of each one keeps its own linecache entry
+_builds = itertools.count(1)
+
+# Python refuses more than 20 statically nested blocks, so deeper subtrees
+# are moved to separate functions.
+_MAX_BLOCK_DEPTH = 12
+
+
+class _Compiler(object):
+
+    def __init__(self, fail_fast=False):
+        super(_Compiler, self).__init__()
+
+        self.fail_fast = fail_fast
+        self.namespace = {
+            "DataError": DataError,
+            "Undefined": Undefined,
+            "string_types": string_types,
+            "iteritems": iteritems,
+        }
+        self.functions = []
+        self.compiled = {}
+        self.constants = {}
+        self.counter = 0
+
+    def name(self, prefix):
+        self.counter += 1
+        return "{0}{1}".format(prefix, self.counter)
+
+    def const(self, obj, prefix="c"):
+        key = (id(obj), prefix)
+
+        if key not in self.constants:
+            name = self.name(prefix)
+            self.namespace[name] = obj
+            self.constants[key] = (name, obj)  # keep obj alive while compiling
+
+        return self.constants[key][0]
+
+    def error(self, code, *params):
+        if not params:
+            return "raise DataError(code={0!r})".format(code)
+
+        return "raise DataError(code={0!r}, params={1})".format(code, self.const(params, "params"))
+
+    def record(self, errors, key, error="err"):
+        """
+        Code which stores error of an item, or raises it at once in
+        fail-fast mode.
+        """
+        if self.fail_fast:
+            return "raise DataError({{{0}: {1}}})".format(key, error)
+
+        return "{0}[{1}] = {2}".format(errors, key, error)
+
+    def call(self, function, src):
+        """
+        Code which calls `check` or `_check` of a validator that is not
+        compiled inline.
+        """
+        if self.fail_fast:
+            return "{0}({1}, True)".format(function, src)
+
+        return "{0}({1})".format(function, src)
+
+    def function(self, validator):
+        """
+        Compile validator into a separate top-level function and return its
+        name. Functions are memoized per node, so recursive Forward trees
+        compile to recursive functions.
+        """
+        key = id(validator)
+
+        if key in self.compiled:
+            return self.compiled[key][0]
+
+        name = self.name("check_")
+        self.compiled[key] = (name, validator)
+
+        lines = ["def {0}(value):".format(name)]
+        self.node(validator, "value", "result", lines, 1, 1)
+        lines.append("    return result")
+        self.functions.append(lines)
+
+        return name
+
+    def node(self, validator, src, dst, lines, indent, depth):
+        """
+        Emit code that checks expression `src` with `validator` and stores
+        the result to `dst`, raising DataError on failure.
+        """
+        emitter = self.emitters.get(validator.__class__)
+
+        if emitter is None:
+            lines.append("{0}{1} = {2}".format(
+                "    " * indent, dst, self.call(self.const(validator.check, "check"), src)))
+            return
+
+        if depth >= _MAX_BLOCK_DEPTH:
+            lines.append("{0}{1} = {2}({3})".format("    " * indent, dst, self.function(validator), src))
+            return
+
+        emitter(self, validator, src, dst, lines, indent, depth)
+
+        pad = "    " * indent
+
+        if validator._converters:
+            for converter in validator._converters:
+                lines.append("{0}{1} = {2}({1})".format(pad, dst, self.const(converter, "conv")))
+
+        elif validator.__class__ is String and validator.regex is not None:
+            lines.append("{0}{1} = {1}.group()".format(pad, dst))
+
+    def emit_any(self, validator, src, dst, lines, indent, depth):
+        lines.append("{0}{1} = {2}".format("    " * indent, dst, src))
+
+    def emit_type(self, validator, src, dst, lines, indent, depth):
+        pad = "    " * indent
+        lines.append("{0}if not isinstance({1}, {2}):".format(pad, src, self.const(validator.type, "type")))
+        lines.append("{0}    {1}".format(pad, self.error("not_type", validator.type)))
+        lines.append("{0}{1} = {2}".format(pad, dst, src))
+
+    def emit_null(self, validator, src, dst, lines, indent, depth):
+        pad = "    " * indent
+        lines.append("{0}if {1} is not None:".format(pad, src))
+        lines.append("{0}    {1}".format(pad, self.error("not_none")))
+        lines.append("{0}{1} = {2}".format(pad, dst, src))
+
+    def emit_bool(self, validator, src, dst, lines, indent, depth):
+        pad = "    " * indent
+        lines.append("{0}if {1} is True or {1} is False:".format(pad, src))
+        lines.append("{0}    {1} = {2}".format(pad, dst, src))
+        lines.append("{0}else:".format(pad))
+
+        if validator.convert:
+            lines.append("{0}    {1} = {2}({3})".format(pad, dst, self.const(validator._convert, "convert"), src))
+        else:
+            lines.append("{0}    {1}".format(pad, self.error("not_bool")))
+
+    def emit_number(self, validator, src, dst, lines, indent, depth):
+        pad = "    " * indent
+        lines.append("{0}if {1}.__class__ is {2}:".format(pad, src, validator._value_type.__name__))
+        lines.append("{0}    {1} = {2}".format(pad, dst, src))
+        lines.append("{0}else:".format(pad))
+        lines.append("{0}    {1} = {2}({3})".format(pad, dst, self.const(validator._convert, "convert"), src))
+
+        bounds = (("gte", "<"), ("lte", ">"), ("lt", ">="), ("gt", "<="))
+
+        for name, operator in bounds:
+            bound = getattr(validator, name)
+
+            if bound is None:
+                continue
+
+            lines.append("{0}if {1} {2} {3}:".format(pad, dst, operator, self.const(bound, name)))
+            lines.append("{0}    {1}".format(pad, self.error(name, bound)))
+
+    def emit_atom(self, validator, src, dst, lines, indent, depth):
+        pad = "    " * indent
+        atom = self.const(validator.value, "atom")
+        lines.append("{0}if {1} != {2}:".format(pad, atom, src))
+        lines.append("{0}    {1}".format(pad, self.error("not_exactly", validator.value)))
+        lines.append("{0}{1} = {2}".format(pad, dst, atom))
+
+    def emit_string(self, validator, src, dst, lines, indent, depth):
+        pad = "    " * indent
+        lines.append("{0}if not isinstance({1}, string_types):".format(pad, src))
+        lines.append("{0}    {1}".format(pad, self.error("not_string")))
+
+        if validator.regex is not None:
+            lines.append("{0}{1} = {2}({3})".format(pad, dst, self.const(validator.regex.match, "match"), src))
+            lines.append("{0}if not {1}:".format(pad, dst))
+            lines.append("{0}    {1}".format(pad, self.error("not_match")))
+            return
+
+        if not validator.allow_empty:
+            lines.append("{0}if not {1}:".format(pad, src))
+            lines.append("{0}    {1}".format(pad, self.error("empty")))
+
+        lines.append("{0}{1} = {2}".format(pad, dst, src))
+
+    def emit_list(self, validator, src, dst, lines, indent, depth):
+        pad = "    " * indent
+        result, errors = self.name("result"), self.name("errors")
+        index, item, checked = self.name("index"), self.name("item"), self.name("checked")
+
+        lines.append("{0}if not isinstance({1}, list):".format(pad, src))
+        lines.append("{0}    {1}".format(pad, self.error("not_list")))
+
+        if validator.min_length:
+            lines.append("{0}if len({1}) < {2}:".format(pad, src, validator.min_length))
+            lines.append("{0}    {1}".format(pad, self.error("min_length", validator.min_length)))
+
+        if validator.max_length is not None:
+            lines.append("{0}if len({1}) > {2}:".format(pad, src, validator.max_length))
+            lines.append("{0}    {1}".format(pad, self.error("max_length", validator.max_length)))
+
+        lines.append("{0}{1} = []".format(pad, result))
+        lines.append("{0}{1} = {{}}".format(pad, errors))
+        lines.append("{0}for {1}, {2} in enumerate({3}):".format(pad, index, item, src))
+        lines.append("{0}    try:".format(pad))
+        self.node(validator.validator, item, checked, lines, indent + 2, depth + 2)
+        lines.append("{0}    except DataError as err:".format(pad))
+        lines.append("{0}        {1}".format(pad, self.record(errors, index)))
+        lines.append("{0}    else:".format(pad))
+        lines.append("{0}        {1}.append({2})".format(pad, result, checked))
+        lines.append("{0}if {1}:".format(pad, errors))
+        lines.append("{0}    raise DataError({1})".format(pad, errors))
+        lines.append("{0}{1} = {2}".format(pad, dst, result))
+
+    def emit_tuple(self, validator, src, dst, lines, indent, depth):
+        pad = "    " * indent
+        items, errors = self.name("items"), self.name("errors")
+        length = len(validator.validators)
+
+        lines.append("{0}try:".format(pad))
+        lines.append("{0}    {1} = tuple({2})".format(pad, items, src))
+        lines.append("{0}except TypeError:".format(pad))
+        lines.append("{0}    {1}".format(pad, self.error("not_tuple")))
+        lines.append("{0}if len({1}) != {2}:".format(pad, items, length))
+        lines.append("{0}    {1}".format(pad, self.error("tuple_length", length)))
+        lines.append("{0}{1} = {{}}".format(pad, errors))
+
+        checked = []
+
+        for idx, item_validator in enumerate(validator.validators):
+            name = self.name("checked")
+            checked.append(name)
+            lines.append("{0}try:".format(pad))
+            self.node(item_validator, "{0}[{1}]".format(items, idx), name, lines, indent + 1, depth + 1)
+            lines.append("{0}except DataError as err:".format(pad))
+            lines.append("{0}    {1}".format(pad, self.record(errors, idx)))
+
+        lines.append("{0}if {1}:".format(pad, errors))
+        lines.append("{0}    raise DataError({1})".format(pad, errors))
+        lines.append("{0}{1} = ({2}{3})".format(pad, dst, ", ".join(checked), "," if length == 1 else ""))
+
+    def emit_dict(self, validator, src, dst, lines, indent, depth):
+        if validator._soft_keys or not validator._simple_keys:
+            lines.append("{0}{1} = {2}".format(
+                "    " * indent, dst, self.call(self.const(validator._check, "check"), src)))
+            return
+
+        pad = "    " * indent
+        collect, errors, present = self.name("collect"), self.name("errors"), self.name("present")
+        item = self.name("item")
+
+        lines.append("{0}if not isinstance({1}, dict):".format(pad, src))
+        lines.append("{0}    {1}".format(pad, self.error("not_dict")))
+        lines.append("{0}{1} = {{}}".format(pad, collect))
+        lines.append("{0}{1} = {{}}".format(pad, errors))
+        lines.append("{0}{1} = 0".format(pad, present))
+
+        for key in validator._hard_keys:
+            name = self.const(key.name, "key")
+
+            lines.append("{0}if {1} in {2}:".format(pad, name, src))
+            lines.append("{0}    {1} += 1".format(pad, present))
+            lines.append("{0}    {1} = {2}[{3}]".format(pad, item, src, name))
+
+            if key.optional:
+                self.emit_key(key, item, collect, errors, lines, indent + 1, depth + 1)
+                continue
+
+            if key.default is Undefined:
+                self.emit_key(key, item, collect, errors, lines, indent + 1, depth + 1)
+                lines.append("{0}else:".format(pad))
+                lines.append("{0}    {1}".format(pad, self.record(errors, name, "DataError(code='required')")))
+                continue
+
+            default = self.const(key.default, "default")
+            lines.append("{0}else:".format(pad))
+            lines.append("{0}    {1} = {2}{3}".format(pad, item, default, "()" if callable(key.default) else ""))
+            self.emit_key(key, item, collect, errors, lines, indent, depth)
+
+        names = self.const(validator._hard_names, "names")
+        lines.append("{0}if {1} != len({2}):".format(pad, present, src))
+        lines.append("{0}    for {1} in {2}:".format(pad, item, src))
+        lines.append("{0}        if {1} not in {2}:".format(pad, item, names))
+        lines.append("{0}            {1}".format(pad, self.record(
+            errors, item, "DataError(code='not_allowed', params=({0}, ))".format(item))))
+        lines.append("{0}if {1}:".format(pad, errors))
+        lines.append("{0}    raise DataError({1})".format(pad, errors))
+        lines.append("{0}{1} = {2}".format(pad, dst, collect))
+
+    def emit_key(self, key, item, collect, errors, lines, indent, depth):
+        pad = "    " * indent
+        checked = self.name("checked")
+        to_name = self.const(key._get_name(), "key")
+
+        lines.append("{0}try:".format(pad))
+        self.node(key.validator, item, checked, lines, indent + 1, depth + 1)
+        lines.append("{0}except DataError as err:".format(pad))
+        lines.append("{0}    {1}".format(pad, self.record(errors, to_name)))
+        lines.append("{0}else:".format(pad))
+        lines.append("{0}    {1}[{2}] = {3}".format(pad, collect, to_name, checked))
+
+    def emit_mapping(self, validator, src, dst, lines, indent, depth):
+        pad = "    " * indent
+        collect, errors, pair_errors = self.name("collect"), self.name("errors"), self.name("pair_errors")
+        key, value = self.name("key"), self.name("value")
+        checked_key, checked_value = self.name("checked"), self.name("checked")
+
+        lines.append("{0}{1} = {{}}".format(pad, collect))
+        lines.append("{0}{1} = {{}}".format(pad, errors))
+        lines.append("{0}for {1}, {2} in iteritems({3}):".format(pad, key, value, src))
+        lines.append("{0}    {1} = {{}}".format(pad, pair_errors))
+        lines.append("{0}    try:".format(pad))
+        self.node(validator.validator_key, key, checked_key, lines, indent + 2, depth + 2)
+        lines.append("{0}    except DataError as err:".format(pad))
+        lines.append("{0}        {1}['key'] = err".format(pad, pair_errors))
+
+        if self.fail_fast:
+            lines.append("{0}        raise DataError({{{1}: DataError({2})}})".format(pad, key, pair_errors))
+
+        lines.append("{0}    try:".format(pad))
+        self.node(validator.validator_value, value, checked_value, lines, indent + 2, depth + 2)
+        lines.append("{0}    except DataError as err:".format(pad))
+        lines.append("{0}        {1}['value'] = err".format(pad, pair_errors))
+        lines.append("{0}    if {1}:".format(pad, pair_errors))
+        lines.append("{0}        {1}".format(pad, self.record(errors, key, "DataError({0})".format(pair_errors))))
+        lines.append("{0}    else:".format(pad))
+        lines.append("{0}        {1}[{2}] = {3}".format(pad, collect, checked_key, checked_value))
+        lines.append("{0}if {1}:".format(pad, errors))
+        lines.append("{0}    raise DataError({1})".format(pad, errors))
+        lines.append("{0}{1} = {2}".format(pad, dst, collect))
+
+    def emit_or(self, validator, src, dst, lines, indent, depth):
+        pad = "    " * indent
+
+        if validator._ranking is not None:
+            # the order of variants changes at runtime
+            lines.append("{0}{1} = {2}".format(pad, dst, self.call(self.const(validator._check, "check"), src)))
+            return
+
+        errors = self.name("errors")
+
+        lines.append("{0}{1} = []".format(pad, errors))
+        lines.append("{0}while True:".format(pad))
+
+        for branch in validator.validators:
+            checked = self.name("checked")
+            lines.append("{0}    try:".format(pad))
+            self.node(branch, src, checked, lines, indent + 2, depth + 2)
+            lines.append("{0}    except DataError as err:".format(pad))
+            lines.append("{0}        {1}.append(({2}, err))".format(pad, errors, self.const(branch, "branch")))
+            lines.append("{0}    else:".format(pad))
+            lines.append("{0}        {1} = {2}".format(pad, dst, checked))
+            lines.append("{0}        break".format(pad))
+
+        lines.append("{0}    raise DataError(code='variants', params=({1}, ))".format(pad, errors))
+
+    def emit_enum(self, validator, src, dst, lines, indent, depth):
+        # the lookup handles unhashable values and normalization
+        lines.append("{0}{1} = {2}({3})".format(
+            "    " * indent, dst, self.const(validator._check, "check"), src))
+
+    def emit_callable(self, validator, src, dst, lines, indent, depth):
+        pad = "    " * indent
+        lines.append("{0}if not callable({1}):".format(pad, src))
+        lines.append("{0}    {1}".format(pad, self.error("not_callable")))
+        lines.append("{0}{1} = {2}".format(pad, dst, src))
+
+    def emit_call(self, validator, src, dst, lines, indent, depth):
+        lines.append("{0}{1} = {2}({3})".format(
+            "    " * indent, dst, self.const(validator.function, "function"), src))
+
+    def emit_forward(self, validator, src, dst, lines, indent, depth):
+        if validator.max_depth is not None:
+            # the depth of data is limited by the stack of Forward._check
+            lines.append("{0}{1} = {2}".format(
+                "    " * indent, dst, self.call(self.const(validator._check, "check"), src)))
+            return
+
+        if validator.validator is None:
+            call = self.const(validator._check, "check")
+        else:
+            call = self.function(validator.validator)
+
+        lines.append("{0}{1} = {2}({3})".format("    " * indent, dst, call, src))
+
+    emitters = {
+        Any: emit_any,
+        Type: emit_type,
+        Null: emit_null,
+        Bool: emit_bool,
+        Float: emit_number,
+        Int: emit_number,
+        Atom: emit_atom,
+        String: emit_string,
+        List: emit_list,
+        Tuple: emit_tuple,
+        Dict: emit_dict,
+        Mapping: emit_mapping,
+        Or: emit_or,
+        Enum: emit_enum,
+        Callable: emit_callable,
+        Call: emit_call,
+        Forward: emit_forward,
+    }
+
+    def build(self, validator):
+        name = self.function(validator)
+        source = "\n\n".join("\n".join(lines) for lines in reversed(self.functions)) + "\n"
+
+        filename = "<pinvl-compiled {0} #{1}>".format(name, next(_builds))
+        linecache.cache[filename] = (len(source), None, source.splitlines(True), filename)
+
+        exec(_builtin_compile(source, filename, "exec"), self.namespace)
+
+        function = self.namespace[name]
+        function.source = source
+        return function
+
+
+def compile(validator, fail_fast=False):
+    """
+    Compile validator (instance or class) into a function which takes value
+    and returns the same result as `validator.check(value, fail_fast)`,
+    raising the same DataError on failure.
+    """
+    return _Compiler(fail_fast).build(ValidatorBase._ensure_validator(validator))
+
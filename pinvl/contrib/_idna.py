@@ -0,0 +1,54 @@
+# -*- coding: utf-8 -*-
+
+"""
+Helpers for validators of internationalized domain names.
+"""
+
+import encodings.idna  # it enables idna encode/decode in python3
+from .._compat import *
+
+
+__all__ = ("is_ascii", "to_ascii")
+
+
+CACHE_SIZE = 4096
+
+# domain -> ACE form or None if it can't be encoded; cleared when full
+_cache = {}
+
+
+if hasattr(text_type, "isascii"):
+    def is_ascii(value):
+        return value.isascii()
+
+else:
+    def is_ascii(value):
+        try:
+            value.encode("ascii")
+        except UnicodeError:
+            return False
+
+        return True
+
+
+def to_ascii(domain):
+    """
+    Encodes internationalized domain name to ACE form ("xn--..." labels),
+    returns None if it can't be encoded.
+    """
+    try:
+        return _cache[domain]
+    except KeyError:
+        pass
+
+    try:
+        encoded = domain.encode("idna").decode("ascii")
+    except UnicodeError:
+        encoded = None
+
+    if len(_cache) >= CACHE_SIZE:
+        _cache.clear()
+
+    _cache[domain] = encoded
+
+    return encoded
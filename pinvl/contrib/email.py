@@ -1,9 +1,9 @@
 # -*- coding: utf-8 -*-
 
 import re
-import encodings.idna  # it enables idna encode/decode in python3
 from ..validators import String, DataError
 from .._compat import *
+from ._idna import is_ascii, to_ascii
 
 
 class Email(String):
@@ -21,6 +21,8 @@ class Email(String):
     'value is not a valid email address'
     """
 
+    __slots__ = ()
+
     _email_regex = re.compile(
         r"(?P<name>^[-!#$%&'*+/=?^_`{}|~0-9A-Z]+(\.[-!#$%&'*+/=?^_`{}|~0-9A-Z]+)*"  # dot-atom
         r'|^"([\001-\010\013\014\016-\037!#-\[\]-\177]|\\[\001-011\013\014\016-\177])*"'  # quoted-string
@@ -29,29 +31,48 @@ class Email(String):
         re.IGNORECASE
     )
 
+    # RFC 5321, 4.5.3.1
+    _max_name_length = 64
+    _max_domain_length = 255
+
     def __init__(self):
-        super(Email, self).__init__(self._email_regex)
+        super(Email, self).__init__(regex=self._email_regex)
 
     def _check(self, value):
+        # Cheap checks reject most junk before the regex. The domain-part is
+        # encoded with IDNA only if it is not ASCII.
+        if isinstance(value, binary_type):
+            try:
+                value = value.decode("utf-8")
+            except UnicodeError:
+                raise self._invalid_email()
+
+        if not isinstance(value, string_types) or not value:
+            raise self._invalid_email()
+
+        if value[0] != "[":  # not the literal form
+            name, at, domain = value.rpartition("@")
+
+            if not at or not name or not domain or len(name) > self._max_name_length or \
+                    len(domain) > self._max_domain_length or not is_ascii(name):
+                raise self._invalid_email()
+
+            if not is_ascii(domain):
+                domain = to_ascii(domain)
+
+                if domain is None or len(domain) > self._max_domain_length:
+                    raise self._invalid_email()
+
+                value = "{0}@{1}".format(name, domain)
+
+            elif "." not in domain:
+                raise self._invalid_email()
+
         try:
             return super(Email, self)._check(value)
         except DataError:
-            if value and isinstance(value, bytes):
-                value = value.decode("utf-8")
+            raise self._invalid_email()
 
-            # Trivial case failed. Try for possible IDN domain-part
-            if value and "@" in value:
-                parts = value.split("@")
-
-                try:
-                    parts[-1] = parts[-1].encode("idna").decode('ascii')
-                except UnicodeError:
-                    pass
-                else:
-                    try:
-                        return super(Email, self)._check("@".join(parts))
-                    except DataError:
-                        # Will fail with main error
-                        pass
-
-        raise DataError("value is not a valid email address")
+    @staticmethod
+    def _invalid_email():
+        return DataError("value is not a valid email address")
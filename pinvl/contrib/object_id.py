@@ -11,5 +11,7 @@ class MongoId(TypeConvert):
     Type check & convert bson.ObjectId values
     """
 
+    __slots__ = ()
+
     _convertable = string_types
     _value_type = ObjectId
@@ -1,28 +1,146 @@
 # -*- coding: utf-8 -*-
 
-from dateutil.parser import parse
-from datetime import datetime
+import re
+from datetime import datetime, timedelta
+from importlib import import_module
 from ..validators import TypeConvert, DataError
 from .._compat import *
 
+try:
+    from datetime import timezone
+except ImportError:  # python 2
+    from dateutil.tz import tzoffset
+
+    def timezone(offset):
+        return tzoffset(None, offset.days * 86400 + offset.seconds)
+
+    timezone.utc = timezone(timedelta(0))
+
+
+_RFC_3339 = re.compile(
+    r"([0-9]{4})-([0-9]{2})-([0-9]{2})[Tt ]([0-9]{2}):([0-9]{2}):([0-9]{2})(?:\.([0-9]+))?"
+    r"(?:[Zz]|([+-])([0-9]{2}):([0-9]{2}))\Z"
+)
+
+_fromisoformat = getattr(datetime, "fromisoformat", None)
+
+# "+hh:mm" -> tzinfo, there are only a few dozen offsets in use
+_timezones = {}
+
+
+def parse_rfc_3339(value):
+    """
+    Parses RFC 3339 timestamp, like "2017-05-12T10:20:30.5+03:00", returns
+    timezone-aware datetime or None if value is not such timestamp.
+    Fractions of seconds are truncated to microseconds.
+    """
+    match = _RFC_3339.match(value)
+
+    if match is None:
+        return None
+
+    if _fromisoformat is not None:
+        try:
+            return _fromisoformat(value)
+        except ValueError:
+            pass  # lowercase "t" or "z", long fractions, or older python
+
+    year, month, day, hour, minute, second, fraction, sign, offset_hours, offset_minutes = match.groups()
+
+    try:
+        return datetime(
+            int(year), int(month), int(day), int(hour), int(minute), int(second),
+            int(fraction[:6].ljust(6, "0")) if fraction else 0,
+            _timezone(sign, offset_hours, offset_minutes),
+        )
+    except ValueError:
+        return None
+
+
+def _timezone(sign, hours, minutes):
+    if sign is None:
+        return timezone.utc
+
+    key = (sign, hours, minutes)
+
+    try:
+        return _timezones[key]
+    except KeyError:
+        pass
+
+    offset = timedelta(hours=int(hours), minutes=int(minutes))
+    tz = _timezones[key] = timezone(-offset if sign == "-" else offset)
+
+    return tz
+
 
 class DateTime(TypeConvert):
 
     """
-    Class for support parsing date im RFC3339 formats via dateutil.parse helper
+    Checks datetime values and converts RFC 3339 timestamps to timezone-aware
+    datetime. With `lenient=True` other strings are parsed by dateutil,
+    which must be installed.
+
+    >>> DateTime().check("2017-05-12T10:20:30Z")
+    datetime.datetime(2017, 5, 12, 10, 20, 30, tzinfo=datetime.timezone.utc)
+    >>> DateTime().is_valid("12 May 2017")
+    False
     """
 
+    __slots__ = ("lenient", )
+
     _convertable = string_types
     _value_type = datetime
 
+    def __init__(self, lenient=False):
+        super(DateTime, self).__init__()
+
+        if lenient:
+            import_module("dateutil.parser")  # fail early if it isn't installed
+
+        self.lenient = lenient
+
     def _convert(self, value):
-        if isinstance(self, self._value_type):
+        converted = self._coerce(value)
+
+        if converted is Undefined:
+            if isinstance(value, self._convertable):
+                raise DataError(code="not_date")
+
+            raise self._cannot_convert(value)
+
+        return converted
+
+    def _coerce(self, value):
+        if isinstance(value, datetime):
             return value
 
         if not isinstance(value, self._convertable):
-            raise self._cannot_convert()
+            return Undefined
 
-        try:
-            value = parse(value)
-        except ValueError:
-            raise DataError("value cannot be parsed as date")
+        converted = parse_rfc_3339(value)
+
+        if converted is None and self.lenient:
+            from dateutil.parser import parse
+
+            try:
+                converted = parse(value)
+            except (ValueError, OverflowError):
+                pass
+
+        return Undefined if converted is None else converted
+
+    def _is_valid(self, value):
+        return self._coerce(value) is not Undefined
+
+    def _input_types(self):
+        if self._overrides(DateTime, "_check", "_convert", "_coerce"):
+            return None
+
+        return (datetime, ) + string_types
+
+    def repr(self, memo):
+        if not self.lenient:
+            return "<{0}>".format(self.__class__.__name__)
+
+        return "<{0}(lenient)>".format(self.__class__.__name__)
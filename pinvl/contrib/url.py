@@ -1,9 +1,9 @@
 # -*- coding: utf-8 -*-
 
 import re
-import encodings.idna  # it enables idna encode/decode in python3
 from ..validators import String, DataError
 from .._compat import *
+from ._idna import is_ascii, to_ascii
 
 
 class URL(String):
@@ -15,6 +15,8 @@ class URL(String):
     'http://xn--e1afmkfd.xn--p1ai/resource/?param=value#anchor'
     """
 
+    __slots__ = ()
+
     _url_regex = re.compile(
         r'^(?:http|ftp)s?://'  # http:// or https://
         r'(?:(?:[A-Z0-9](?:[A-Z0-9-]{0,61}[A-Z0-9])?\.)+(?:[A-Z]{2,6}\.?|[A-Z0-9-]{2,}\.?)|'  # domain...
@@ -25,39 +27,38 @@ class URL(String):
         re.IGNORECASE
     )
 
+    _schemes = ("http://", "https://", "ftp://", "ftps://")
+
     def __init__(self):
-        super(URL, self).__init__(self._url_regex)
+        super(URL, self).__init__(regex=self._url_regex)
 
     def _check(self, value):
-        try:
-            return super(URL, self)._check(value)
-        except DataError:
-            pass
-
-        if not value:
-            raise self._invalid_url()
-
-        # Trivial case failed. Try for possible IDN domain-part
+        # Cheap checks reject most junk before the regex. The host is
+        # encoded with IDNA only if the URL is not ASCII.
         if isinstance(value, binary_type):
             try:
                 value = value.decode("utf-8")
             except UnicodeError:
                 raise self._invalid_url()
 
-        try:
-            scheme, netloc, path, query, fragment = urlparse.urlsplit(value)
-        except ValueError:
+        if not isinstance(value, string_types) or not value[:8].lower().startswith(self._schemes):
             raise self._invalid_url()
 
-        try:
-            netloc = netloc.encode("idna").decode("ascii")  # IDN -> ACE
-        except UnicodeError:  # invalid domain part
-            raise self._invalid_url()
+        if not is_ascii(value):
+            try:
+                scheme, netloc, path, query, fragment = urlparse.urlsplit(value)
+            except ValueError:
+                raise self._invalid_url()
 
-        url = urlparse.urlunsplit((scheme, netloc, path, query, fragment))
+            netloc = to_ascii(netloc)  # IDN -> ACE
+
+            if netloc is None:
+                raise self._invalid_url()
+
+            value = urlparse.urlunsplit((scheme, netloc, path, query, fragment))
 
         try:
-            return super(URL, self)._check(url)
+            return super(URL, self)._check(value)
         except DataError:
             raise self._invalid_url()
 
@@ -0,0 +1,301 @@
+# -*- coding: utf-8 -*-
+
+"""
+Per-node instrumentation of validator trees.
+
+While a `Profiler` is enabled in the current thread or asyncio context,
+every `check` of every validator there is counted and timed under the
+path of the node in the tree being checked, like
+``Dict.users -> List -> Dict.email -> String``: class names of the nodes
+from the root, with the key of `Dict`, ``key``/``value`` of `Mapping` and
+the index of `Tuple` through which the child was reached. The time of a
+node includes the time of its children. Recursion through a `Forward`
+is folded into the path where the `Forward` was first reached, so a
+recursive schema has as many paths as its tree has nodes.
+
+`ValidatorBase.check` hands the check over to the profiler of the context
+if there is one; it looks it up only while some profiler is enabled, so
+there is almost no overhead when none is. Checks which do not go through
+`check` (`is_valid` of built-in validators, vectorized `check_batch`) are
+not seen.
+
+>>> from pinvl.validators import Dict, List, String
+>>> validator = Dict(users=List(Dict(email=String)))
+>>> with Profiler() as profiler:  # doctest: +IGNORE_EXCEPTION_DETAIL
+...     validator.check({"users": [{"email": "a@b.c"}, {"email": 1}]})
+Traceback (most recent call last):
+...
+DataError: ...
+>>> profiler.stats()["Dict.users -> List -> Dict.email -> String"]["errors"]
+{'not_string': 1}
+>>> print(profiler.prometheus())  # doctest: +ELLIPSIS
+# HELP pinvl_node_calls_total ...
+"""
+
+import threading
+import time
+
+from . import validators
+from .validators import DataError, Dict, Forward, Mapping, Tuple
+from ._compat import *
+
+
+__all__ = ("Profiler", )
+
+
+_timer = getattr(time, "perf_counter", time.time)
+
+# guards the count of enabled profilers, `validators._profiled`
+_lock = threading.Lock()
+
+# codes of errors of Dict items raised by Dict itself, not by its children
+_DICT_CODES = frozenset(("required", "not_allowed"))
+
+
+class _Node(object):
+
+    __slots__ = ("calls", "seconds", "failures", "errors")
+
+    def __init__(self):
+        self.calls = 0
+        self.seconds = 0.0
+        self.failures = 0
+        self.errors = {}
+
+
+class Profiler(object):
+
+    """
+    Collects call count, cumulative time, failure count and histogram of
+    failure codes of each node of the checked validators. It is used as a
+    context manager, with `enable` and `disable`, or for one call with
+    `check`, and is enabled only in the current thread or asyncio context.
+    Profilers may be nested, the innermost one collects the stats. Stats
+    are kept when it is disabled and added up when it is enabled again.
+    """
+
+    def __init__(self):
+        self.nodes = {}
+        self.lock = threading.Lock()
+        self.local = threading.local()
+        # (path of parent, id of child) -> (path of child, child, {id of
+        # Forward on the path: its path})
+        self.paths = {}
+        # tokens to restore the profiler of the context, one per enable
+        self.tokens = []
+
+    def enable(self):
+        with _lock:
+            validators._profiled += 1
+
+        self.tokens.append(validators._profiler.set(self))
+
+        return self
+
+    def disable(self):
+        if not self.tokens:
+            raise RuntimeError("profiler is not enabled")
+
+        validators._profiler.reset(self.tokens.pop())
+
+        with _lock:
+            validators._profiled -= 1
+
+    def check(self, validator, value, fail_fast=False):
+        """
+        Checks value with validator, profiling only this call.
+        """
+        with self:
+            return validator.check(value, True) if fail_fast else validator.check(value)
+
+    def __enter__(self):
+        return self.enable()
+
+    def __exit__(self, *exc_info):
+        self.disable()
+
+    def clear(self):
+        with self.lock:
+            self.nodes.clear()
+
+    def _check(self, validator, value, fail_fast):
+        """
+        Checks value as `ValidatorBase.check` does, recording the node.
+        """
+        stack = self._stack()
+        entry = self._path(stack[-1] if stack else None, validator)
+        stack.append(entry)
+        path = entry[0]
+        start = _timer()
+
+        try:
+            if fail_fast:
+                value = validator._converted(validator._check_fail_fast(value))
+            else:
+                value = validator._converted(validator._check(value))
+        except DataError as err:
+            self._record(path, validator, _timer() - start, err)
+            raise
+        finally:
+            stack.pop()
+
+        self._record(path, validator, _timer() - start, None)
+
+        return value
+
+    def _stack(self):
+        try:
+            return self.local.stack
+        except AttributeError:
+            self.local.stack = []
+            return self.local.stack
+
+    def _path(self, parent, validator):
+        """
+        Returns (path, validator, forwards) entry of the stack for the
+        validator checked by parent entry.
+        """
+        if parent is None:
+            parent_path, forwards = None, {}
+        else:
+            parent_path, forwards = parent[0], parent[2]
+
+            # a Forward which is already on the path closes a cycle
+            if id(validator) in forwards:
+                return forwards[id(validator)], validator, forwards
+
+        try:
+            return self.paths[parent_path, id(validator)]
+        except KeyError:
+            pass
+
+        name = validator.__class__.__name__
+
+        if parent is not None:
+            name = "{0}{1} -> {2}".format(parent_path, _edge(parent[1], validator), name)
+
+        if isinstance(validator, Forward):
+            forwards = dict(forwards)
+            forwards[id(validator)] = name
+
+        # the validator is kept with its path, so its id is not reused
+        entry = self.paths[parent_path, id(validator)] = (name, validator, forwards)
+
+        return entry
+
+    def _record(self, path, validator, seconds, error):
+        with self.lock:
+            node = self.nodes.get(path)
+
+            if node is None:
+                node = self.nodes[path] = _Node()
+
+            node.calls += 1
+            node.seconds += seconds
+
+            if error is not None:
+                node.failures += 1
+
+                for code in _codes(validator, error):
+                    node.errors[code] = node.errors.get(code, 0) + 1
+
+    def stats(self):
+        """
+        Returns {path: {"calls", "seconds", "failures", "errors"}} dict,
+        where "errors" counts failures by code, "custom" for errors
+        raised without a code.
+        """
+        with self.lock:
+            return dict(
+                (path, {
+                    "calls": node.calls,
+                    "seconds": node.seconds,
+                    "failures": node.failures,
+                    "errors": dict(node.errors),
+                })
+                for path, node in iteritems(self.nodes)
+            )
+
+    def prometheus(self, prefix="pinvl"):
+        """
+        Returns stats in Prometheus text exposition format.
+        """
+        stats = sorted(iteritems(self.stats()))
+        lines = []
+
+        for name, kind, help_text, field in (
+            ("node_calls_total", "counter", "Checks of validator node.", "calls"),
+            ("node_seconds_total", "counter", "Time spent in checks of validator node.", "seconds"),
+            ("node_failures_total", "counter", "Failed checks of validator node.", "failures"),
+        ):
+            lines.append("# HELP {0}_{1} {2}".format(prefix, name, help_text))
+            lines.append("# TYPE {0}_{1} {2}".format(prefix, name, kind))
+
+            for path, node in stats:
+                lines.append('{0}_{1}{{path="{2}"}} {3!r}'.format(prefix, name, _escape(path), node[field]))
+
+        lines.append("# HELP {0}_node_errors_total Failed checks of validator node by code.".format(prefix))
+        lines.append("# TYPE {0}_node_errors_total counter".format(prefix))
+
+        for path, node in stats:
+            for code, count in sorted(iteritems(node["errors"])):
+                lines.append('{0}_node_errors_total{{path="{1}",code="{2}"}} {3}'.format(
+                    prefix, _escape(path), _escape(code), count))
+
+        return "\n".join(lines) + "\n"
+
+
+def _codes(validator, error):
+    """
+    Codes of the failures of validator itself in its error: errors of
+    containers are the errors of their children, except for missing and
+    extra keys of `Dict`.
+    """
+    if not isinstance(error._error, dict):
+        return (error.code if error.code is not None else "custom", )
+
+    if not isinstance(validator, Dict):
+        return ()
+
+    children = set(key.to_name or key.name for key in validator._hard_keys)
+
+    return [
+        item.code for key, item in iteritems(error._error)
+        if isinstance(item, DataError) and (item.code in _DICT_CODES or
+                                            item.code == "variants" and key not in children)
+    ]
+
+
+def _edge(parent, validator):
+    """
+    Describes how parent reached its child validator.
+    """
+    if isinstance(parent, Dict):
+        for key in parent._hard_keys:
+            if key.validator is validator:
+                return ".{0}".format(key.name)
+
+        for mapping in parent._soft_keys:
+            if mapping.validator_key is validator:
+                return ".*key"
+
+            if mapping.validator_value is validator:
+                return ".*value"
+
+    elif isinstance(parent, Mapping):
+        if parent.validator_key is validator:
+            return ".key"
+
+        if parent.validator_value is validator:
+            return ".value"
+
+    elif isinstance(parent, Tuple):
+        for index, item in enumerate(parent.validators):
+            if item is validator:
+                return "[{0}]".format(index)
+
+    return ""
+
+
+def _escape(value):
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
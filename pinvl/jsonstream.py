@@ -0,0 +1,414 @@
+# -*- coding: utf-8 -*-
+
+"""
+Validation of JSON documents while they are parsed.
+
+`check_json` reads JSON text from a string, a file, a socket file or any
+iterable of chunks and feeds it into the validator tree token by token.
+`List`, `Dict` and `Forward` nodes are walked as the text is read, so the
+document is rejected at the first violation: the rest of it is not read
+and the values of rejected containers are never built. Other validators
+get the parsed value of their node and check it as usual.
+
+Errors are those of `check(value, fail_fast=True)` for the first violation
+in the document order. Malformed JSON raises `JSONError`.
+
+>>> from pinvl.validators import Dict, List, Int
+>>> check_json(Dict(ids=List(Int)), '{"ids": [1, 2, "3"]}')
+{'ids': [1, 2, 3]}
+>>> try:
+...     check_json(Dict(ids=List(Int)), '{"ids": [1, "a", {"rest": "is never parsed"')
+... except DataError as err:
+...     print(err.as_dict())
+{'ids': {1: 'value cannot be converted to int'}}
+"""
+
+import codecs
+import re
+from json.decoder import JSONDecoder, scanstring
+
+from .validators import DataError, Dict, Forward, List, ValidatorBase
+from ._compat import *
+
+
+__all__ = ("check_json", "JSONError")
+
+
+_WHITESPACE = re.compile(r"[ \t\n\r]*")
+_NUMBER = re.compile(r"-?(?:0|[1-9][0-9]*)(\.[0-9]+)?([eE][-+]?[0-9]+)?")
+_NUMBER_CHARS = re.compile(r"[-+.0-9eE]*")
+# the body of a string up to its closing quote, or up to the end of buffer
+_STRING_BODY = re.compile(r'[^"\\]*(?:\\.[^"\\]*)*', re.DOTALL)
+_LITERALS = {"t": ("true", True), "f": ("false", False), "n": ("null", None)}
+
+
+class JSONError(ValueError):
+
+    """
+    Source is not valid JSON. `position` is the offset of the failed char,
+    None when it is not known.
+    """
+
+    def __init__(self, reason, position):
+        if position is None:
+            super(JSONError, self).__init__(reason)
+        else:
+            super(JSONError, self).__init__("{0} (char {1})".format(reason, position))
+
+        self.reason = reason
+        self.position = position
+
+
+def _reject_constant(name):
+    # the json module takes NaN, Infinity and -Infinity, JSON does not
+    raise JSONError("{0} is not valid JSON".format(name), None)
+
+
+_decoder = JSONDecoder(parse_constant=_reject_constant)
+
+
+def check_json(validator, source, chunk_size=65536):
+    """
+    Parses JSON document and checks it with validator at the same time.
+    Source is str or bytes, file-like object with `read` method, or any
+    iterable of str or bytes chunks. Bytes are decoded as UTF-8.
+    """
+    reader = _Reader(source, chunk_size)
+
+    try:
+        value = reader.check(ValidatorBase._ensure_validator(validator))
+    except RecursionError:
+        reader.fail("document is nested too deep")
+
+    if reader.peek():
+        reader.fail("extra data")
+
+    return value
+
+
+def _read_chunks(source, chunk_size):
+    while True:
+        chunk = source.read(chunk_size)
+
+        if not chunk:
+            return
+
+        yield chunk
+
+
+class _Reader(object):
+
+    """
+    Incremental JSON parser over a buffer which is refilled from source and
+    forgets consumed text. Strings are scanned by the json module.
+    """
+
+    def __init__(self, source, chunk_size):
+        if isinstance(source, (text_type, binary_type)):
+            self.chunks = iter((source, ))
+        elif hasattr(source, "read"):
+            self.chunks = _read_chunks(source, chunk_size)
+        else:
+            self.chunks = iter(source)
+
+        self.decoder = codecs.getincrementaldecoder("utf-8-sig")()
+        self.buffer = ""
+        self.pos = 0
+        self.offset = 0
+        self.eof = False
+        self.dict_keys = {}
+        # chars scanned by failed `raw_decode` since the last refill
+        self.wasted = 0
+
+    def more(self):
+        """
+        Appends the next chunk to the buffer, returns False at the end.
+        """
+        while not self.eof:
+            try:
+                chunk = next(self.chunks)
+            except StopIteration:
+                self.eof = True
+                chunk = self.decode(b"", True)
+            else:
+                if isinstance(chunk, binary_type):
+                    chunk = self.decode(chunk)
+
+            if chunk:
+                if self.pos:
+                    self.offset += self.pos
+                    self.buffer = self.buffer[self.pos:]
+                    self.pos = 0
+
+                self.buffer += chunk
+                self.wasted = 0
+                return True
+
+        return False
+
+    def decode(self, chunk, final=False):
+        try:
+            return self.decoder.decode(chunk, final)
+        except UnicodeDecodeError as err:
+            self.fail("invalid UTF-8: {0}".format(err.reason))
+
+    def fail(self, reason):
+        raise JSONError(reason, self.offset + self.pos)
+
+    def peek(self):
+        """
+        Skips whitespace, returns the next char or "" at the end.
+        """
+        if self.pos < len(self.buffer) and self.buffer[self.pos] not in " \t\n\r":
+            return self.buffer[self.pos]
+
+        while True:
+            self.pos = _WHITESPACE.match(self.buffer, self.pos).end()
+
+            if self.pos < len(self.buffer):
+                return self.buffer[self.pos]
+
+            if not self.more():
+                return ""
+
+    def expect(self, char):
+        if self.peek() != char:
+            self.fail("expecting {0!r}".format(char))
+
+        self.pos += 1
+
+    def separator(self, end):
+        """
+        Reads "," or the end of container, returns True at the end.
+        """
+        char = self.peek()
+        self.pos += 1
+
+        if char == ",":
+            return False
+
+        if char == end:
+            return True
+
+        self.pos -= 1
+        self.fail("expecting ',' or {0!r}".format(end))
+
+    def opened(self, end):
+        """
+        Reads "{" or "[" at peek, returns True if the container is empty.
+        """
+        self.pos += 1
+
+        if self.peek() == end:
+            self.pos += 1
+            return True
+
+        return False
+
+    def string(self):
+        # find the closing quote first, scanning each refill only once
+        scanned = 1
+
+        while True:
+            end = _STRING_BODY.match(self.buffer, self.pos + scanned).end()
+
+            if self.buffer.startswith('"', end):
+                break
+
+            scanned = end - self.pos
+
+            if not self.more():
+                break
+
+        try:
+            value, self.pos = scanstring(self.buffer, self.pos + 1, True)
+        except ValueError as err:
+            self.fail(getattr(err, "msg", str(err)))
+
+        return value
+
+    def key(self):
+        if self.peek() != '"':
+            self.fail("expecting property name enclosed in double quotes")
+
+        name = self.string()
+        self.expect(":")
+
+        return name
+
+    def number(self):
+        # the whole token must be in the buffer, "1." is not a number yet
+        while _NUMBER_CHARS.match(self.buffer, self.pos).end() == len(self.buffer) and self.more():
+            pass
+
+        match = _NUMBER.match(self.buffer, self.pos)
+
+        if match is None or match.end() != _NUMBER_CHARS.match(self.buffer, self.pos).end():
+            self.fail("expecting value")
+
+        self.pos = match.end()
+
+        if match.group(1) or match.group(2):
+            return float(match.group())
+
+        try:
+            return int(match.group())
+        except ValueError:  # more digits than int takes
+            self.fail("number is too long")
+
+    def literal(self):
+        word, value = _LITERALS[self.buffer[self.pos]]
+
+        while len(self.buffer) - self.pos < len(word) and self.more():
+            pass
+
+        if not self.buffer.startswith(word, self.pos):
+            self.fail("expecting value")
+
+        self.pos += len(word)
+
+        return value
+
+    def value(self):
+        """
+        Parses the next value without checking it.
+        """
+        char = self.peek()
+
+        # values which are already in the buffer are parsed by the json
+        # module, but a number at the end of the buffer may be cut. Failed
+        # attempts scan up to the end of buffer, containers which are cut
+        # are attempted at every level, so they are limited per refill.
+        if (char in _LITERALS or char in '{["') and self.wasted < len(self.buffer):
+            try:
+                value, self.pos = _decoder.raw_decode(self.buffer, self.pos)
+            except ValueError:
+                self.wasted += len(self.buffer) - self.pos
+            else:
+                return value
+
+        if char == "{":
+            result = {}
+
+            if not self.opened("}"):
+                while True:
+                    name = self.key()
+                    result[name] = self.value()
+
+                    if self.separator("}"):
+                        break
+
+            return result
+
+        if char == "[":
+            result = []
+
+            if not self.opened("]"):
+                while True:
+                    result.append(self.value())
+
+                    if self.separator("]"):
+                        break
+
+            return result
+
+        if char == '"':
+            return self.string()
+
+        if char in _LITERALS:
+            return self.literal()
+
+        return self.number()
+
+    def check(self, validator):
+        """
+        Parses the next value and checks it with validator.
+        """
+        cls = validator.__class__
+
+        if cls is Forward and validator.validator is not None:
+            return validator._converted(self.check(validator.validator))
+
+        if cls is List:
+            return validator._converted(self.check_list(validator))
+
+        if cls is Dict and validator._simple_keys:
+            return validator._converted(self.check_dict(validator))
+
+        return validator.check(self.value(), True)
+
+    def check_list(self, validator):
+        if self.peek() != "[":
+            raise DataError(code="not_list")
+
+        result = []
+
+        if not self.opened("]"):
+            item_validator = validator.validator
+            max_length = validator.max_length
+
+            while True:
+                if max_length is not None and len(result) >= max_length:
+                    raise DataError(code="max_length", params=(max_length, ))
+
+                try:
+                    result.append(self.check(item_validator))
+                except DataError as err:
+                    raise DataError({len(result): err})
+
+                if self.separator("]"):
+                    break
+
+        if len(result) < validator.min_length:
+            raise DataError(code="min_length", params=(validator.min_length, ))
+
+        return result
+
+    def check_dict(self, validator):
+        if self.peek() != "{":
+            raise DataError(code="not_dict")
+
+        try:
+            keys = self.dict_keys[id(validator)]
+        except KeyError:
+            keys = self.dict_keys[id(validator)] = dict((key.name, key) for key in validator._hard_keys)
+
+        result = {}
+        seen = set()
+
+        if not self.opened("}"):
+            while True:
+                name = self.key()
+                key = keys.get(name)
+
+                if key is None:
+                    # soft keys check it, or it is not allowed
+                    validator._check_extra([(name, self.value() if validator._soft_keys else None)],
+                                           result, {}, True)
+
+                else:
+                    seen.add(name)
+
+                    try:
+                        result[key.to_name or name] = self.check(key.validator)
+                    except DataError as err:
+                        raise DataError({key.to_name or name: err})
+
+                if self.separator("}"):
+                    break
+
+        for key in validator._hard_keys:
+            if key.name in seen or key.optional:
+                continue
+
+            if key.default is Undefined:
+                raise DataError({key.name: DataError(code="required")})
+
+            default = key.default() if callable(key.default) else key.default
+
+            try:
+                result[key.to_name or key.name] = key.validator.check(default, True)
+            except DataError as err:
+                raise DataError({key.to_name or key.name: err})
+
+        return result
@@ -0,0 +1,161 @@
+# -*- coding: utf-8 -*-
+
+"""
+Parallel validation of large collections.
+
+`List.check_parallel` and `Mapping.check_parallel` split the value into
+chunks and check them in a process pool, then merge checked items and
+errors into the result and DataError of `check`. The validator is pickled
+once per call and unpickled once per worker process, so it must be
+picklable: converters should be module level functions, not lambdas.
+A pool created for the call gets the validator through its initializer;
+a given `executor` gets it with each chunk, and its workers keep the
+last few validators they have seen.
+
+>>> from concurrent.futures import ProcessPoolExecutor
+>>> from pinvl.validators import List, Int
+>>> with ProcessPoolExecutor(4) as executor:  # doctest: +SKIP
+...     List(Int).check_parallel(rows, executor=executor, chunksize=50000)
+"""
+
+import hashlib
+import pickle
+from collections import OrderedDict
+
+from .validators import DataError
+from ._compat import *
+
+
+__all__ = ("check_list", "check_mapping")
+
+
+# validators unpickled in this worker process, by digest of their pickle,
+# least recently used first
+_validators = OrderedDict()
+
+_MAX_VALIDATORS = 8
+
+
+def check_list(validator, value, executor=None, chunksize=10000):
+    """
+    Parallel counterpart of `List.check`, see `List.check_parallel`.
+    """
+    if not isinstance(value, list):
+        raise DataError(code="not_list")
+
+    if len(value) < validator.min_length:
+        raise DataError(code="min_length", params=(validator.min_length, ))
+
+    if validator.max_length is not None and len(value) > validator.max_length:
+        raise DataError(code="max_length", params=(validator.max_length, ))
+
+    chunks = [(start, value[start:start + chunksize]) for start in range(0, len(value), chunksize)]
+
+    result = []
+    errors = {}
+
+    for checked, failed in _map(_check_items, validator.validator, chunks, executor):
+        result.extend(checked)
+        errors.update(failed)
+
+    if errors:
+        raise DataError(errors)
+
+    return validator._converted(result)
+
+
+def check_mapping(validator, value, executor=None, chunksize=10000):
+    """
+    Parallel counterpart of `Mapping.check`, see `Mapping.check_parallel`.
+    """
+    items = list(iteritems(value))
+    chunks = [(start, items[start:start + chunksize]) for start in range(0, len(items), chunksize)]
+
+    result = {}
+    errors = {}
+
+    for checked, failed in _map(_check_mapping, validator, chunks, executor):
+        result.update(checked)
+        errors.update(failed)
+
+    if errors:
+        raise DataError(errors)
+
+    return validator._converted(result)
+
+
+def _map(function, validator, chunks, executor):
+    """
+    Runs function on chunks in executor, or in this process if there is
+    only one chunk, and yields the results in order.
+    """
+    if len(chunks) < 2:
+        for start, chunk in chunks:
+            yield function(validator, start, chunk)
+
+        return
+
+    payload = pickle.dumps(validator, pickle.HIGHEST_PROTOCOL)
+    digest = hashlib.sha1(payload).hexdigest()
+    own_executor = executor is None
+
+    if own_executor:
+        from concurrent.futures import ProcessPoolExecutor
+
+        try:
+            executor = ProcessPoolExecutor(initializer=_install, initargs=(digest, payload))
+        except TypeError:  # no initializer before Python 3.7
+            executor = ProcessPoolExecutor()
+        else:
+            payload = None
+
+    try:
+        futures = [executor.submit(_run, function, digest, payload, start, chunk) for start, chunk in chunks]
+
+        for future in futures:
+            yield future.result()
+
+    finally:
+        if own_executor:
+            executor.shutdown()
+
+
+def _install(digest, payload):
+    validator = _validators[digest] = pickle.loads(payload)
+
+    while len(_validators) > _MAX_VALIDATORS:
+        _validators.popitem(last=False)
+
+    return validator
+
+
+def _run(function, digest, payload, start, chunk):
+    try:
+        validator = _validators.pop(digest)
+    except KeyError:
+        validator = _install(digest, payload)
+    else:
+        _validators[digest] = validator
+
+    return function(validator, start, chunk)
+
+
+def _check_items(validator, start, items):
+    result = []
+    errors = {}
+    check = validator.check
+
+    for index, item in enumerate(items, start):
+        try:
+            result.append(check(item))
+        except DataError as err:
+            errors[index] = err
+
+    return result, errors
+
+
+def _check_mapping(validator, start, items):  # pylint: disable=W0613
+    try:
+        return validator._check(dict(items)), {}
+    except DataError as err:
+        return {}, err.error
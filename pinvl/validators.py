@@ -1,28 +1,113 @@
 # -*- coding: utf-8 -*-
 
 import copy
+import importlib
+import inspect
 import re
 import numbers
+from decimal import Decimal, InvalidOperation
+import sys
+import threading
+import time
+from collections import namedtuple, OrderedDict
 from ._compat import *
 
 
 __all__ = ("Type", "Any", "Or", "Null", "Bool", "Float", "Int", "Atom",
            "String", "List", "Tuple", "Key", "Dict", "Mapping", "Enum",
-           "Callable", "Call", "Forward", "DataError")
+           "Callable", "Call", "Forward", "Cached", "DataError")
 
 
 # PORTABLE:CODE
+def _variants_error(errors):
+    """
+    Renders errors of failed alternatives, given as (validator, error) pairs,
+    to dict keyed by validator repr.
+    """
+    collected = {}
+
+    for validator, error in errors:
+        collected.setdefault(repr(validator), []).append(error)
+
+    for sncl_repr, err_lst in iteritems(collected):
+        if len(err_lst) == 1:
+            collected[sncl_repr] = err_lst[0]
+        else:
+            collected[sncl_repr] = DataError(dict(enumerate(err_lst)))
+
+    return collected
+
+
 class DataError(ValueError):
 
     """
     Error with data preserve.
     `error` can be a message or None if error raised in childs.
+
+    Validators raise errors with `code` and `params` instead of a message:
+    the message is rendered from `messages` only when `error` is accessed,
+    so rejected values which nobody looks at cost no formatting.
+
+    >>> error = DataError(code="gte", params=(5, ))
+    >>> error.code
+    'gte'
+    >>> error.error
+    'value is less than 5'
     """
 
-    def __init__(self, error=None):
+    messages = {
+        "cannot_convert": "value cannot be converted to {0.__name__}",
+        "not_type": "value is not {0.__name__}",
+        "not_none": "value should be None",
+        "not_bool": "value should be True or False",
+        "not_bool_convertable": "value cannot be converted to bool",
+        "gte": "value is less than {0}",
+        "lte": "value is greater than {0}",
+        "lt": "value should be less than {0}",
+        "gt": "value should be greater than {0}",
+        "not_int": "value is not int",
+        "not_exactly": "value is not exactly {0!r}",
+        "not_string": "value is not a string",
+        "not_match": "value does not match pattern",
+        "empty": "value is empty",
+        "not_list": "value is not list",
+        "min_length": "list length is less than {0}",
+        "max_length": "list length is greater than {0}",
+        "not_tuple": "value must be convertable to tuple",
+        "tuple_length": "value must contain exact {0} items",
+        "not_dict": "value is not dict",
+        "column_length": "column length differs from {0!r} column",
+        "required": "is required",
+        "not_allowed": "{0!r} is not allowed key",
+        "not_variant": "value does not match any variant",
+        "not_callable": "value is not callable",
+        "not_date": "value cannot be parsed as date",
+        "max_depth": "value is nested deeper than {0}",
+        "variants": _variants_error,
+    }
+
+    def __init__(self, error=None, code=None, params=()):
         super(DataError, self).__init__()
 
-        self.error = error
+        self._error = error
+        self.code = code
+        self.params = params
+
+    @property
+    def error(self):
+        if self._error is None and self.code is not None:
+            message = self.messages[self.code]
+
+            if callable(message):
+                self._error = message(*self.params)
+            else:
+                self._error = message.format(*self.params)
+
+        return self._error
+
+    @error.setter
+    def error(self, error):
+        self._error = error
 
     def __str__(self):
         return str(self.error)
@@ -34,8 +119,67 @@ class DataError(ValueError):
         if not isinstance(self.error, dict):
             return self.error
 
-        return dict((k, v.as_dict() if isinstance(v, self.__class__) else v)
-                    for k, v in iteritems(self.error))
+        # without recursion, errors of deep Forward trees are as deep as data
+        result = {}
+        stack = [(self.error, result)]
+
+        while stack:
+            errors, collect = stack.pop()
+
+            for k, v in iteritems(errors):
+                if not isinstance(v, DataError):
+                    collect[k] = v
+                elif isinstance(v.error, dict):
+                    collect[k] = {}
+                    stack.append((v.error, collect[k]))
+                else:
+                    collect[k] = v.error
+
+        return result
+
+
+def _attributes(obj):
+    """
+    Yields (name, value) pairs of attributes of object, from its slots and
+    its `__dict__` if it has one.
+    """
+    for cls in obj.__class__.__mro__:
+        for name in cls.__dict__.get("__slots__", ()):
+            if name not in ("__dict__", "__weakref__") and hasattr(obj, name):
+                yield name, getattr(obj, name)
+
+    for item in iteritems(getattr(obj, "__dict__", {})):
+        yield item
+
+
+# `pinvl.instrument.Profiler` of the current context, `check` looks it up
+# only while any profiler is enabled
+_profiler = ContextVar("pinvl_profiler", default=None)
+_profiled = 0
+
+
+def _getstate(obj):
+    # pickle protocols 0 and 1 can't save slots without it
+    return dict(_attributes(obj))
+
+
+def _setstate(obj, state):
+    for name, value in iteritems(state):
+        setattr(obj, name, value)
+
+
+def _module(name):
+    """
+    Imports a module of the package which is not included in the portable
+    single-file module built by make_portable.py.
+    """
+    package = __name__.rpartition(".")[0]
+
+    if not package:
+        raise ImportError("pinvl.{0} is not included in the portable module, "
+                          "install the pinvl package to use it".format(name))
+
+    return importlib.import_module("{0}.{1}".format(package, name))
 
 
 @implements_metaclass
@@ -57,7 +201,9 @@ class ValidatorMeta(type):
         return cls() | other
 
     def __rshift__(cls, other):
-        return cls() >> other
+        obj = cls()
+        obj.append(other)
+        return obj
 
 
 class ValidatorBase(metaclass(ValidatorMeta), object):
@@ -73,18 +219,42 @@ class ValidatorBase(metaclass(ValidatorMeta), object):
     Check order
     >>> (Int() >> float >> str).check(4)
     '4.0'
+
+    Validators are not changed by operators: ">>", "|", `make_optional` and
+    the shortcuts like `Int[1:]` return new validators which share the
+    unchanged children with the original ones.
+    >>> validator = Int()
+    >>> (validator >> str).check(1), validator.check(1)
+    ('1', 1)
     """
 
+    __slots__ = ("_converters", "__weakref__")
+
+    # classes whose `_is_valid` agrees with their `_check`
+    _is_valid_trusted = {}
+
     def __init__(self):
         super(ValidatorBase, self).__init__()
 
-        self._converters = []
+        self._converters = ()
+
+    __getstate__ = _getstate
+    __setstate__ = _setstate
 
-    def check(self, value):
+    def check(self, value, fail_fast=False):
         """
         Common logic. In subclasses you need to implement _check.
+
+        With `fail_fast` containers stop at the first failed item, so the
+        error holds only the path to it.
         """
-        value = self._check(value)
+        if _profiled and _profiler.get() is not None:
+            return _profiler.get()._check(self, value, fail_fast)
+
+        if fail_fast:
+            value = self._check_fail_fast(value)
+        else:
+            value = self._check(value)
 
         if self._converters:
             for converter in self._converters:
@@ -97,12 +267,100 @@ class ValidatorBase(metaclass(ValidatorMeta), object):
     def _check(self, value):
         raise NotImplementedError()
 
+    def _converted(self, value):
+        """
+        Applies converters to checked value, as `check` does.
+        """
+        if self._converters:
+            for converter in self._converters:
+                value = converter(value)
+
+            return value
+
+        return self._converter_default(value)
+
+    def _check_fail_fast(self, value):
+        """
+        Containers override it to pass `fail_fast` to their `_check`, unless
+        a subclass overrides `_check` without it.
+        """
+        return self._check(value)
+
+    def is_valid(self, value):
+        """
+        Returns True if `check` accepts value, False otherwise. Built-in
+        validators answer without raising DataError. Validators with
+        converters, and subclasses which override `_check`, fall back to
+        catching the error of `check`.
+
+        >>> (Int | Null).is_valid("foo")
+        False
+        """
+        if self._converters or not self._trusts_is_valid():
+            return ValidatorBase._is_valid(self, value)
+
+        return self._is_valid(value)
+
+    def async_check(self, value, concurrency=None):
+        """
+        Coroutine which checks value like `check`, but awaits results of
+        `Call` functions and converters which are awaitable. Items of
+        containers are checked concurrently, at most `concurrency`
+        awaitables are awaited at a time if it is given. See `pinvl.aio`.
+        """
+        return _module("aio").async_check(self, value, concurrency)
+
+    def _is_valid(self, value):
+        try:
+            self.check(value, True)
+        except DataError:
+            return False
+
+        return True
+
+    @classmethod
+    def _trusts_is_valid(cls):
+        try:
+            return cls._is_valid_trusted[cls]
+        except KeyError:
+            pass
+
+        owner = next(base for base in cls.__mro__ if "_is_valid" in base.__dict__)
+        trusted = owner is not ValidatorBase and all(
+            getattr(cls, name, None) == getattr(owner, name, None)
+            for name in ("_check", "_coerce", "_convert", "_converter_default")
+        )
+        cls._is_valid_trusted[cls] = trusted
+
+        return trusted
+
     def _converter_default(self, value):  # pylint: disable=R0201
         """
         You can change default converter with '>>' operator or `append` method.
         """
         return value
 
+    def _input_types(self):
+        """
+        Types of values `_check` may accept, or None if it is unknown.
+        Dispatch indexes rely on it, so a type which can pass the check must
+        never be left out.
+        """
+        return None
+
+    def _input_values(self):
+        """
+        Frozenset of the only values `_check` may accept, or None.
+        """
+        return None
+
+    def _overrides(self, cls, *names):
+        """
+        Checks if the class of the instance overrides any of `names` methods
+        of `cls`, so what `cls` declares about its input can't be trusted.
+        """
+        return any(getattr(self.__class__, name) != getattr(cls, name) for name in names)
+
     @staticmethod
     def _ensure_validator(validator):
         """
@@ -125,13 +383,13 @@ class ValidatorBase(metaclass(ValidatorMeta), object):
                             "ValidatorBase").format(validator))
 
     def append(self, converter):
-        self._converters.append(converter)
+        self._converters = self._converters + (converter, )
 
     def __or__(self, other):
         return Or(self, other)
 
     def __rshift__(self, other):
-        obj = copy.deepcopy(self)
+        obj = copy.copy(self)
         obj.append(other)
         return obj
 
@@ -147,26 +405,42 @@ class ValidatorBase(metaclass(ValidatorMeta), object):
 
 class TypeConvert(ValidatorBase):
 
+    __slots__ = ()
+
     _convertable = ()
     _value_type = type
 
     def _check(self, value):
         return self._convert(value)
 
+    def _is_valid(self, value):
+        return self._coerce(value) is not Undefined
+
     def _convert(self, value):
+        converted = self._coerce(value)
+
+        if converted is Undefined:
+            raise self._cannot_convert(value)
+
+        return converted
+
+    def _coerce(self, value):
+        """
+        Converts value to `_value_type`, returns Undefined if it can't.
+        """
         if isinstance(value, self._value_type):
             return value
 
         if not isinstance(value, self._convertable):
-            raise self._cannot_convert()
+            return Undefined
 
         try:
             return self._value_type(value)
         except ValueError:
-            raise self._cannot_convert()
+            return Undefined
 
-    def _cannot_convert(self):
-        return DataError("value cannot be converted to {0}".format(self._value_type.__name__))
+    def _cannot_convert(self, value=Undefined):  # pylint: disable=W0613
+        return DataError(code="cannot_convert", params=(self._value_type, ))
 
 
 @implements_metaclass
@@ -190,6 +464,8 @@ class Type(metaclass(TypeMeta), ValidatorBase):
     'value is not int'
     """
 
+    __slots__ = ("type", )
+
     def __init__(self, type_):
         super(Type, self).__init__()
 
@@ -197,10 +473,19 @@ class Type(metaclass(TypeMeta), ValidatorBase):
 
     def _check(self, value):
         if not isinstance(value, self.type):
-            raise DataError("value is not {0}".format(self.type.__name__))
+            raise DataError(code="not_type", params=(self.type, ))
 
         return value
 
+    def _is_valid(self, value):
+        return isinstance(value, self.type)
+
+    def _input_types(self):
+        if self._overrides(Type, "_check"):
+            return None
+
+        return (self.type, )
+
     def repr(self, memo):
         return "<{0}({1})>".format(self.__class__.__name__, self.type.__name__)
 
@@ -212,9 +497,46 @@ class Any(ValidatorBase):
     <Any>
     """
 
+    __slots__ = ()
+
     def _check(self, value):
         return value
 
+    def _is_valid(self, value):
+        return True
+
+
+class _Ranking(object):
+
+    """
+    Recent hit counts of `Or` variants and the order to try them in. Every
+    `period` hits variants are sorted by hits, ties keep declaration order,
+    and the counts are halved, so the order follows changes of the input.
+    """
+
+    period = 1000
+
+    def __init__(self, size):
+        self.reset(size)
+
+    def reset(self, size):
+        self.order = tuple(range(size))
+        self.hits = [0] * size
+        self.countdown = self.period
+
+    def hit(self, index):
+        self.hits[index] += 1
+        self.countdown -= 1
+
+        if self.countdown <= 0:
+            self.rank()
+
+    def rank(self):
+        hits = self.hits
+        self.order = tuple(sorted(range(len(hits)), key=lambda index: -hits[index]))
+        self.hits = [count // 2 for count in hits]
+        self.countdown = self.period
+
 
 class Or(ValidatorBase):
 
@@ -227,33 +549,166 @@ class Or(ValidatorBase):
     'test'
     >>> extract_error(null_string, 1)
     {'<Null>': 'value should be None', '<String>': 'value is not a string'}
+
+    With `adaptive=True` variants are tried in the order of how often they
+    matched recently, so a union of message versions where the newest one
+    is the most common doesn't try all old ones first. Results are the same
+    as in declaration order when at most one variant accepts a value, and
+    errors always list variants in declaration order.
+    >>> message = Or(Dict(v=Atom(1)), Dict(v=Atom(2)), adaptive=True)
+    >>> message.check({"v": 2})
+    {'v': 2}
     """
 
-    def __init__(self, *validators):
+    __slots__ = ("validators", "_ranking", "_types", "_by_type")
+
+    def __init__(self, *validators, **kwargs):
+        adaptive = kwargs.pop("adaptive", False)
+
+        if kwargs:
+            raise TypeError("unexpected keyword arguments: {0}".format(", ".join(sorted(kwargs))))
+
         super(Or, self).__init__()
 
-        self.validators = list(map(self._ensure_validator, validators))
+        self.validators = tuple(map(self._ensure_validator, validators))
+        self._ranking = _Ranking(len(self.validators)) if adaptive else None
 
-    def _check(self, value):
+        # Dispatch table: what each variant may accept, and a cache of the
+        # variants which may accept values of the given type.
+        self._types = tuple(validator._input_types() for validator in self.validators)
+        self._by_type = {} if any(types is not None for types in self._types) else None
+
+    def _check(self, value, fail_fast=False):
+        if self._ranking is not None:
+            return self._check_ranked(value, fail_fast)
+
+        if self._by_type is None:
+            errors = []
+
+            for validator in self.validators:
+                try:
+                    return validator.check(value, True) if fail_fast else validator.check(value)
+                except DataError as e:
+                    errors.append((validator, e))
+
+            raise DataError(code="variants", params=(errors, ))
+
+        validators = self.validators
         errors = {}
 
-        for validator in self.validators:
+        for index in self._candidates(value):
+            validator = validators[index]
+
             try:
-                return validator.check(value)
+                return validator.check(value, True) if fail_fast else validator.check(value)
             except DataError as e:
-                errors.setdefault(repr(validator), []).append(e)
+                errors[index] = e
 
-        for sncl_repr, err_lst in iteritems(errors):
-            if len(err_lst) == 1:
-                errors[sncl_repr] = err_lst[0]
+        return self._check_rest(value, fail_fast, errors)
+
+    def _check_ranked(self, value, fail_fast):
+        ranking = self._ranking
+        validators = self.validators
+        candidates = self._candidates(value) if self._by_type is not None else None
+        errors = {}
+
+        for index in ranking.order:
+            if candidates is not None and index not in candidates:
+                continue
+
+            validator = validators[index]
+
+            try:
+                value = validator.check(value, True) if fail_fast else validator.check(value)
+            except DataError as e:
+                errors[index] = e
             else:
-                errors[sncl_repr] = DataError(dict(enumerate(err_lst)))
+                ranking.hit(index)
+                return value
 
-        raise DataError(errors)
+        return self._check_rest(value, fail_fast, errors)
+
+    def _candidates(self, value):
+        """
+        Indexes of variants which may accept the value, in declaration
+        order. Others would fail on its type anyway.
+        """
+        try:
+            return self._by_type[value.__class__]
+        except KeyError:
+            pass
+
+        candidates = self._by_type[value.__class__] = tuple(
+            index for index, types in enumerate(self._types)
+            if types is None or isinstance(value, types)
+        )
+
+        return candidates
+
+    def _check_rest(self, value, fail_fast, errors):
+        """
+        Checks variants which were skipped, when all tried ones failed, so
+        the error lists all variants in declaration order.
+        """
+        collected = []
+
+        for index, validator in enumerate(self.validators):
+            error = errors.get(index)
+
+            if error is None:
+                try:
+                    return validator.check(value, True) if fail_fast else validator.check(value)
+                except DataError as e:
+                    error = e
+
+            collected.append((validator, error))
+
+        raise DataError(code="variants", params=(collected, ))
+
+    def _check_fail_fast(self, value):
+        if self._overrides(Or, "_check"):
+            return self._check(value)
+
+        return self._check(value, True)
+
+    def _is_valid(self, value):
+        validators = self.validators
+
+        order = self._ranking.order if self._ranking is not None else range(len(validators))
+
+        candidates = self._candidates(value) if self._by_type is not None else None
+
+        for index in order:
+            if candidates is not None and index not in candidates:
+                continue
+
+            if validators[index].is_valid(value):
+                return True
+
+        return False
+
+    def _input_types(self):
+        if self._overrides(Or, "_check"):
+            return None
+
+        types = ()
+
+        for validator in self.validators:
+            validator_types = validator._input_types()
+
+            if validator_types is None:
+                return None
+
+            types += validator_types
+
+        return types
 
     def __or__(self, validator):
-        validators = self.validators[:]
-        validators.append(validator)
+        validators = self.validators + (validator, )
+
+        if self._ranking is not None:
+            return self.__class__(*validators, adaptive=True)
+
         return self.__class__(*validators)
 
     def repr(self, memo):
@@ -273,12 +728,23 @@ class Null(ValidatorBase):
     'value should be None'
     """
 
+    __slots__ = ()
+
     def _check(self, value):
         if value is not None:
-            raise DataError("value should be None")
+            raise DataError(code="not_none")
 
         return value
 
+    def _is_valid(self, value):
+        return value is None
+
+    def _input_types(self):
+        if self._overrides(Null, "_check"):
+            return None
+
+        return (type(None), )
+
 
 class Bool(ValidatorBase):
 
@@ -311,6 +777,8 @@ class Bool(ValidatorBase):
     False
     """
 
+    __slots__ = ("convert", )
+
     _convertable = string_types + integer_types
 
     _aliases_true  = frozenset((True,  1, "true",  "t"  "yes", "y", "1"))
@@ -326,11 +794,25 @@ class Bool(ValidatorBase):
             return value
 
         if not self.convert:
-            raise DataError("value should be True or False")
+            raise DataError(code="not_bool")
 
         return self._convert(value)
 
+    def _is_valid(self, value):
+        if isinstance(value, bool):
+            return True
+
+        return self.convert and self._coerce(value) is not Undefined
+
     def _convert(self, value):
+        converted = self._coerce(value)
+
+        if converted is Undefined:
+            raise DataError(code="not_bool_convertable")
+
+        return converted
+
+    def _coerce(self, value):
         if isinstance(value, self._convertable):
             if isinstance(value, string_types):
                 value = value.strip().lower()
@@ -341,7 +823,16 @@ class Bool(ValidatorBase):
             if value in self._aliases_false:
                 return False
 
-        raise DataError("value cannot be converted to bool")
+        return Undefined
+
+    def _input_types(self):
+        if self._overrides(Bool, "_check", "_convert"):
+            return None
+
+        if self.convert:
+            return (bool, ) + self._convertable
+
+        return (bool, )
 
     def repr(self, memo):
         if not self.convert:
@@ -394,41 +885,104 @@ class NumberMeta(ValidatorMeta):
 class NumberBase(metaclass(NumberMeta), TypeConvert):
 
     """
-    Base class for Float and Int.
+    Base class for Float and Int. With `strict=True` only instances of the
+    number type (but not bools) pass, nothing is converted.
     """
 
-    _convertable = string_types + (numbers.Real, )
+    __slots__ = ("gte", "lte", "gt", "lt", "strict")
 
-    def __init__(self, gte=None, lte=None, gt=None, lt=None):
+    _convertable = string_types + (numbers.Real, Decimal)
+
+    def __init__(self, gte=None, lte=None, gt=None, lt=None, strict=False):
         super(NumberBase, self).__init__()
 
         self.gte = gte
         self.lte = lte
         self.gt = gt
         self.lt = lt
+        self.strict = strict
 
     def _check(self, value):
         value = self._convert(value)
 
         if self.gte is not None and value < self.gte:
-            raise DataError("value is less than {0}".format(self.gte))
+            raise DataError(code="gte", params=(self.gte, ))
 
         if self.lte is not None and value > self.lte:
-            raise DataError("value is greater than {0}".format(self.lte))
+            raise DataError(code="lte", params=(self.lte, ))
 
         if self.lt is not None and value >= self.lt:
-            raise DataError("value should be less than {0}".format(self.lt))
+            raise DataError(code="lt", params=(self.lt, ))
 
         if self.gt is not None and value <= self.gt:
-            raise DataError("value should be greater than {0}".format(self.gt))
+            raise DataError(code="gt", params=(self.gt, ))
 
         return value
 
+    def _is_valid(self, value):
+        value = self._coerce(value)
+
+        if value is Undefined:
+            return False
+
+        return not (
+            (self.gte is not None and value < self.gte) or
+            (self.lte is not None and value > self.lte) or
+            (self.lt is not None and value >= self.lt) or
+            (self.gt is not None and value <= self.gt)
+        )
+
+    def _coerce(self, value):
+        if self.strict:
+            if isinstance(value, self._value_type) and not isinstance(value, bool):
+                return value
+
+            return Undefined
+
+        return self._parse(value)
+
+    def _parse(self, value):
+        """
+        Converts value to the number type, returns Undefined if it can't.
+        """
+        if isinstance(value, self._value_type):
+            return value
+
+        if not isinstance(value, self._convertable):
+            return Undefined
+
+        try:
+            return self._value_type(value)
+        except (ValueError, OverflowError):
+            return Undefined
+
+    def _cannot_convert(self, value=Undefined):
+        if self.strict:
+            return DataError(code="not_type", params=(self._value_type, ))
+
+        return super(NumberBase, self)._cannot_convert(value)
+
+    def _input_types(self):
+        parse = Int._parse if isinstance(self, Int) else NumberBase._parse
+
+        if self._overrides(NumberBase, "_check", "_coerce") or self._overrides(TypeConvert, "_convert") or \
+                self.__class__._parse != parse:
+            return None
+
+        if self.strict:
+            return (self._value_type, )
+
+        return (self._value_type, ) + self._convertable
+
     def __lt__(self, lt):
-        return self.__class__(gte=self.gte, lte=self.lte, gt=self.gt, lt=lt)
+        obj = copy.copy(self)
+        obj.lt = lt
+        return obj
 
     def __gt__(self, gt):
-        return self.__class__(gte=self.gte, lte=self.lte, gt=gt, lt=self.lt)
+        obj = copy.copy(self)
+        obj.gt = gt
+        return obj
 
     def repr(self, memo):
         options = []
@@ -439,6 +993,9 @@ class NumberBase(metaclass(NumberMeta), TypeConvert):
             if value is not None:
                 options.append("{0}={1}".format(name, value))
 
+        if self.strict:
+            options.append("strict=True")
+
         if not options:
             return "<{0}>".format(self.__class__.__name__)
 
@@ -474,6 +1031,8 @@ class Float(NumberBase):
     5.0
     """
 
+    __slots__ = ()
+
     _value_type = float
 
 
@@ -488,26 +1047,94 @@ class Int(NumberBase):
     'value is not int'
     >>> extract_error(Int(), 1 + 1j)
     'value is not int'
+
+    Strings and numbers are converted exactly, without going through float.
+    >>> Int().check("9007199254740993")
+    9007199254740993
+    >>> Int().check("1e3")
+    1000
     """
 
+    __slots__ = ()
+
     _value_type = int
 
-    def _convert(self, value):
+    def _parse(self, value):
         if isinstance(value, self._value_type):
             return value
 
+        if isinstance(value, string_types):
+            if value.isdigit():
+                try:
+                    return int(value)
+                except ValueError:
+                    pass  # digits like "²" which int doesn't accept
+
+            # the syntax is the one of float, which also rejects most
+            # non-integral values at once
+            try:
+                number = float(value)
+            except ValueError:
+                return Undefined
+
+            if number - number == 0 and not number.is_integer():
+                return Undefined
+
+            try:
+                return _integral(Decimal(value))
+            except InvalidOperation:
+                return Undefined
+
+        if isinstance(value, float):
+            return int(value) if value.is_integer() else Undefined
+
+        if isinstance(value, numbers.Integral):
+            return int(value)
+
+        if isinstance(value, Decimal):
+            return _integral(value)
+
+        if isinstance(value, numbers.Rational):
+            return int(value.numerator) if value.denominator == 1 else Undefined
+
         if not isinstance(value, self._convertable):
-            raise self._cannot_convert()
+            return Undefined
 
         try:
             value = float(value)
+        except (ValueError, OverflowError):
+            return Undefined
+
+        return int(value) if value.is_integer() else Undefined
+
+    def _cannot_convert(self, value=Undefined):
+        if self.strict or not isinstance(value, self._convertable):
+            return super(Int, self)._cannot_convert(value)
+
+        # it is a number, but not an integral one
+        try:
+            float(value)
         except ValueError:
-            raise self._cannot_convert()
+            return super(Int, self)._cannot_convert(value)
+        except OverflowError:
+            pass
+
+        return DataError(code="not_int")
 
-        if not value.is_integer():
-            raise DataError("value is not int")
 
-        return int(value)
+# Decimals with more digits are not converted to int, like longer strings
+# by `int` in newer pythons, so huge exponents can't exhaust memory.
+_MAX_INT_DIGITS = 4300
+
+
+def _integral(value):
+    """
+    Converts Decimal to int if it is integral, returns Undefined otherwise.
+    """
+    if not value.is_finite() or value.adjusted() >= _MAX_INT_DIGITS or value != value.to_integral_value():
+        return Undefined
+
+    return int(value)
 
 
 class Atom(ValidatorBase):
@@ -519,6 +1146,8 @@ class Atom(ValidatorBase):
     "value is not exactly 'atom'"
     """
 
+    __slots__ = ("value", )
+
     def __init__(self, value):
         super(Atom, self).__init__()
 
@@ -526,10 +1155,22 @@ class Atom(ValidatorBase):
 
     def _check(self, value):
         if self.value != value:
-            raise DataError("value is not exactly {0!r}".format(self.value))
+            raise DataError(code="not_exactly", params=(self.value, ))
 
         return self.value
 
+    def _is_valid(self, value):
+        return not self.value != value
+
+    def _input_values(self):
+        if self._overrides(Atom, "_check"):
+            return None
+
+        try:
+            return frozenset((self.value, ))
+        except TypeError:
+            return None
+
 
 class String(ValidatorBase):
 
@@ -548,6 +1189,8 @@ class String(ValidatorBase):
     'value does not match pattern'
     """
 
+    __slots__ = ("allow_empty", "regex")
+
     _re_compiled_type = re.compile(r"").__class__
 
     def __init__(self, allow_empty=False, regex=None, flags=0):
@@ -564,21 +1207,36 @@ class String(ValidatorBase):
 
     def _check(self, value):
         if not isinstance(value, string_types):
-            raise DataError("value is not a string")
+            raise DataError(code="not_string")
 
         if self.regex is not None:
             match = self.regex.match(value)
 
             if not match:
-                raise DataError("value does not match pattern")
+                raise DataError(code="not_match")
 
             return match
 
         if not self.allow_empty and not value:
-            raise DataError("value is empty")
+            raise DataError(code="empty")
 
         return value
 
+    def _is_valid(self, value):
+        if not isinstance(value, string_types):
+            return False
+
+        if self.regex is not None:
+            return self.regex.match(value) is not None
+
+        return bool(self.allow_empty or value)
+
+    def _input_types(self):
+        if self._overrides(String, "_check"):
+            return None
+
+        return string_types
+
     def _converter_default(self, value):
         if self.regex is not None:
             return value.group()
@@ -586,20 +1244,14 @@ class String(ValidatorBase):
         return value
 
     def __deepcopy__(self, memo):
-        # workaround for http://bugs.python.org/issue10076
-        memo[id(self)] = self
-
-        copied_dict = {}
+        # compiled patterns can't be deep copied before python 3.7, see
+        # http://bugs.python.org/issue10076, they are immutable anyway
+        obj = copy.copy(self)
+        memo[id(self)] = obj
 
-        for key, value in iteritems(self.__dict__):
-            if isinstance(value, self._re_compiled_type):
-                copied_dict[key] = value
-            else:
-                copied_dict[key] = copy.deepcopy(value, memo)
-
-        obj = self.__class__()
-        obj.__dict__.clear()
-        obj.__dict__.update(copied_dict)
+        for name, value in _attributes(self):
+            if not isinstance(value, self._re_compiled_type):
+                setattr(obj, name, copy.deepcopy(value, memo))
 
         return obj
 
@@ -682,6 +1334,8 @@ class List(metaclass(SquareBracketsMeta), ValidatorBase):
     {0: 'value cannot be converted to int'}
     """
 
+    __slots__ = ("validator", "min_length", "max_length")
+
     def __init__(self, validator, min_length=0, max_length=None):
         super(List, self).__init__()
 
@@ -689,45 +1343,142 @@ class List(metaclass(SquareBracketsMeta), ValidatorBase):
         self.min_length = min_length
         self.max_length = max_length
 
-    def _check(self, value):
+    def _check(self, value, fail_fast=False):
         if not isinstance(value, list):
-            raise DataError("value is not list")
+            raise DataError(code="not_list")
 
         if len(value) < self.min_length:
-            raise DataError("list length is less than {0}".format(self.min_length))
+            raise DataError(code="min_length", params=(self.min_length, ))
 
         if self.max_length is not None and len(value) > self.max_length:
-            raise DataError("list length is greater than {0}".format(self.max_length))
+            raise DataError(code="max_length", params=(self.max_length, ))
 
+        validator = self.validator
         result = []
         errors = {}
 
         for index, item in enumerate(value):
             try:
-                result.append(self.validator.check(item))
+                result.append(validator.check(item, True) if fail_fast else validator.check(item))
             except DataError as err:
                 errors[index] = err
 
+                if fail_fast:
+                    break
+
         if errors:
             raise DataError(errors)
 
         return result
 
-    def repr(self, memo):
-        options = []
+    def _check_fail_fast(self, value):
+        if self._overrides(List, "_check"):
+            return self._check(value)
 
-        if self.min_length:
-            options.append("min_length={0}".format(self.min_length))
+        return self._check(value, True)
 
-        if self.max_length:
-            options.append("max_length={0}".format(self.max_length))
+    def _is_valid(self, value):
+        if not isinstance(value, list) or len(value) < self.min_length:
+            return False
 
-        return "<{0}({1}{2}{3})>".format(self.__class__.__name__, ", ".join(options),
-                                         " | " if options else "", self.validator.repr(memo))
+        if self.max_length is not None and len(value) > self.max_length:
+            return False
 
+        is_valid = self.validator.is_valid
 
-class Tuple(ValidatorBase):
-    """
+        for item in value:
+            if not is_valid(item):
+                return False
+
+        return True
+
+    def check_batch(self, value):
+        """
+        Checks every item of list, tuple or one-dimensional NumPy array and
+        returns (result, errors) pair instead of raising on bad items:
+        checked items which passed, in order, and {index: DataError} dict of
+        failed ones. Length of value is checked as by `check`, converters of
+        the list itself are not applied. Items checked by plain Int or Float
+        are checked with vectorized NumPy operations if NumPy is installed,
+        the result is an array then if value is an array. Items checked by
+        plain Dict are pivoted into columns which are checked the same way.
+
+        >>> List(Int[0:10]).check_batch([1, "2", 30])
+        ([1, 2], {2: DataError(value is greater than 10)})
+        """
+        return _module("batch").check_list(self, value)
+
+    def check_parallel(self, value, executor=None, chunksize=10000):
+        """
+        Same as `check`, but items are checked in chunks of `chunksize` in
+        a process pool: `executor` (any concurrent.futures executor) or a
+        new ProcessPoolExecutor. The validator must be picklable.
+        """
+        return _module("parallel").check_list(self, value, executor, chunksize)
+
+    def iter_check(self, iterable):
+        """
+        Checks items of any iterable one at a time, without building lists
+        of items and results, and yields (index, checked item) pair for each
+        item, or (index, DataError) pair if it is failed. Length limits are
+        checked on the way: DataError is raised as soon as there are more
+        than `max_length` items, or at the end if there are less than
+        `min_length`. Converters of the list itself are not applied.
+
+        >>> for index, item in List(Int).iter_check(iter(["1", "a"])):
+        ...     print(index, repr(item))
+        0 1
+        1 DataError(value cannot be converted to int)
+
+        With JSON lines file: List(...).iter_check(json.loads(line) for line in f)
+        """
+        if isinstance(iterable, string_types) or isinstance(iterable, dict):
+            raise DataError(code="not_list")
+
+        try:
+            iterator = iter(iterable)
+        except TypeError:
+            raise DataError(code="not_list")
+
+        check = self.validator.check
+        max_length = self.max_length
+        index = -1
+
+        for index, item in enumerate(iterator):
+            if max_length is not None and index >= max_length:
+                raise DataError(code="max_length", params=(max_length, ))
+
+            try:
+                item = check(item)
+            except DataError as err:
+                item = err
+
+            yield index, item
+
+        if index + 1 < self.min_length:
+            raise DataError(code="min_length", params=(self.min_length, ))
+
+    def _input_types(self):
+        if self._overrides(List, "_check"):
+            return None
+
+        return (list, )
+
+    def repr(self, memo):
+        options = []
+
+        if self.min_length:
+            options.append("min_length={0}".format(self.min_length))
+
+        if self.max_length:
+            options.append("max_length={0}".format(self.max_length))
+
+        return "<{0}({1}{2}{3})>".format(self.__class__.__name__, ", ".join(options),
+                                         " | " if options else "", self.validator.repr(memo))
+
+
+class Tuple(ValidatorBase):
+    """
     Tuple checker can be used to check fixed tuples, like (Int, Int, String).
 
     >>> t = Tuple(Int, Int, String)
@@ -739,36 +1490,62 @@ class Tuple(ValidatorBase):
     <Tuple(<Int>, <Int>, <String>)
     """
 
+    __slots__ = ("validators", )
+
     def __init__(self, *args):
         super(Tuple, self).__init__()
 
         self.validators = tuple(map(self._ensure_validator, args))
 
-    def _check(self, value):
+    def _check(self, value, fail_fast=False):
         try:
             value = tuple(value)
         except TypeError:
-            raise DataError("value must be convertable to tuple")
+            raise DataError(code="not_tuple")
 
         length = len(self.validators)
 
         if len(value) != length:
-            raise DataError("value must contain exact {0} items".format(length))
+            raise DataError(code="tuple_length", params=(length, ))
 
         result = []
         errors = {}
 
         for idx, (item, validator) in enumerate(zip(value, self.validators)):
             try:
-                result.append(validator.check(item))
+                result.append(validator.check(item, True) if fail_fast else validator.check(item))
             except DataError as err:
                 errors[idx] = err
 
+                if fail_fast:
+                    break
+
         if errors:
             raise DataError(errors)
 
         return tuple(result)
 
+    def _check_fail_fast(self, value):
+        if self._overrides(Tuple, "_check"):
+            return self._check(value)
+
+        return self._check(value, True)
+
+    def _is_valid(self, value):
+        try:
+            value = tuple(value)
+        except TypeError:
+            return False
+
+        if len(value) != len(self.validators):
+            return False
+
+        for item, validator in zip(value, self.validators):
+            if not validator.is_valid(item):
+                return False
+
+        return True
+
     def repr(self, memo):
         return "<{0}({1})>".format(
             self.__class__.__name__,
@@ -782,6 +1559,8 @@ class Key(object):
     Helper class for Dict.
     """
 
+    __slots__ = ("name", "to_name", "default", "optional", "validator")
+
     def __init__(self, name, default=Undefined, optional=False, to_name=None, validator=None):
         super(Key, self).__init__()
 
@@ -791,13 +1570,16 @@ class Key(object):
         self.optional = optional
         self.validator = validator or Any()
 
+    __getstate__ = _getstate
+    __setstate__ = _setstate
+
     def pop(self, data):
         if self.name in data:
             yield (self._get_name(), catch_error(self.validator, data.pop(self.name)))
-            raise StopIteration()
+            return
 
         if self.optional:
-            raise StopIteration()
+            return
 
         default = self.default
 
@@ -806,9 +1588,9 @@ class Key(object):
                 default = default()
 
             yield (self._get_name(), catch_error(self.validator, default))
-            raise StopIteration()
+            return
 
-        yield (self.name, DataError("is required"))
+        yield (self.name, DataError(code="required"))
 
     def _get_name(self):
         return self.to_name or self.name
@@ -817,13 +1599,16 @@ class Key(object):
         yield self.name
 
     def __rshift__(self, name):
-        key = copy.deepcopy(self)
+        key = copy.copy(self)
         key.to_name = name
         return key
 
     def __cmp__(self, other):
         return cmp(self.name, other.name)
 
+    def __lt__(self, other):
+        return self.name < other.name
+
     def __str__(self):
         return "{0}={1}".format(self.name, self.validator)
 
@@ -863,11 +1648,13 @@ class Dict(ValidatorBase):
         'value cannot be converted to int'}}}}
     """
 
+    __slots__ = ("_hard_keys", "_soft_keys", "_hard_names", "_simple_keys", "_soft_filters", "_soft_by_type")
+
     def __init__(self, *args, **kwargs):
         super(Dict, self).__init__()
 
-        self._hard_keys = []
-        self._soft_keys = []
+        hard_keys = []
+        soft_keys = []
 
         validators = {}
 
@@ -879,26 +1666,178 @@ class Dict(ValidatorBase):
         for key, validator in iteritems(validators):
             if isinstance(key, ValidatorBase) or \
                     (isinstance(key, class_types) and issubclass(key, ValidatorBase)):
-                self._soft_keys.append(Mapping(key, validator))
+                soft_keys.append(Mapping(key, validator))
 
             else:
-                if not isinstance(key, Key):
+                if isinstance(key, Key):
+                    key = copy.copy(key)  # the same key may be used by other Dict
+                else:
                     key = Key(key)
 
                 key.validator = self._ensure_validator(validator)
-                self._hard_keys.append(key)
+                hard_keys.append(key)
+
+        self._hard_keys = tuple(hard_keys)
+        self._soft_keys = tuple(soft_keys)
+        self._hard_names = frozenset(self.keys_names())
+
+        # Plain keys with unique names can be checked without copying the
+        # input and popping keys from it.
+        self._simple_keys = len(self._hard_names) == len(self._hard_keys) and \
+            all(key.__class__ is Key for key in self._hard_keys)
+
+        # Soft keys index: what each key validator may accept, and a cache
+        # of soft keys which may accept keys of the given type.
+        self._soft_filters = tuple(
+            (mapping, mapping.validator_key._input_types(), mapping.validator_key._input_values())
+            for mapping in self._soft_keys
+        )
+        self._soft_by_type = {} if self._soft_keys else None
 
     def make_optional(self, *args):
+        """
+        Returns copy of Dict with optional keys, all ("*" or no names) or
+        the given ones.
+        """
+        obj = copy.copy(self)
+        hard_keys = []
+
         for key in self._hard_keys:
-            if not args or key.name in args:
+            if not args or "*" in args or key.name in args:
+                key = copy.copy(key)
                 key.optional = True
 
-        return self
+            hard_keys.append(key)
 
-    def _check(self, value):
+        obj._hard_keys = tuple(hard_keys)
+
+        return obj
+
+    def _check(self, value, fail_fast=False):
+        if not isinstance(value, dict):
+            raise DataError(code="not_dict")
+
+        if not self._simple_keys:
+            return self._check_pop(value, fail_fast)
+
+        collect = {}
+        errors = {}
+        present = 0
+
+        for key in self._hard_keys:
+            name = key.name
+
+            if name in value:
+                present += 1
+                item = value[name]
+
+            elif key.optional:
+                continue
+
+            elif key.default is not Undefined:
+                item = key.default() if callable(key.default) else key.default
+
+            else:
+                errors[name] = DataError(code="required")
+
+                if fail_fast:
+                    raise DataError(errors)
+
+                continue
+
+            validator = key.validator
+
+            try:
+                collect[key.to_name or name] = validator.check(item, True) if fail_fast else validator.check(item)
+            except DataError as err:
+                errors[key.to_name or name] = err
+
+                if fail_fast:
+                    raise DataError(errors)
+
+        if present != len(value):
+            hard_names = self._hard_names
+            self._check_extra([(k, v) for k, v in iteritems(value) if k not in hard_names],
+                              collect, errors, fail_fast)
+
+        if errors:
+            raise DataError(errors)
+
+        return collect
+
+    def check_columns(self, columns):
+        """
+        Checks dict of columns, {key name: list, tuple or array of values},
+        as if each row was checked by `check`. Returns (result, errors)
+        pair: dict of checked columns without the failed rows and
+        {row index: DataError} dict of failed ones. Each column is checked
+        at once, see `List.check_batch`.
+
+        >>> Dict(foo=Int).check_columns({"foo": [1, "x", "2"]})
+        ({'foo': [1, 2]}, {1: DataError({'foo': DataError(value cannot be converted to int)})})
+        """
+        return _module("batch").check_columns(self, columns)
+
+    def _check_fail_fast(self, value):
+        if self._overrides(Dict, "_check"):
+            return self._check(value)
+
+        return self._check(value, True)
+
+    def _is_valid(self, value):
         if not isinstance(value, dict):
-            raise DataError("value is not dict")
+            return False
+
+        if not self._simple_keys:
+            return ValidatorBase._is_valid(self, value)
+
+        present = 0
+
+        for key in self._hard_keys:
+            name = key.name
+
+            if name in value:
+                present += 1
+                item = value[name]
+
+            elif key.optional:
+                continue
+
+            elif key.default is not Undefined:
+                item = key.default() if callable(key.default) else key.default
+
+            else:
+                return False
+
+            if not key.validator.is_valid(item):
+                return False
+
+        if present == len(value):
+            return True
+
+        if not self._soft_keys:
+            return False
+
+        hard_names = self._hard_names
+
+        for k, v in iteritems(value):
+            if k in hard_names:
+                continue
 
+            for mapping in self._soft_candidates(k):
+                if mapping.validator_key.is_valid(k) and mapping.validator_value.is_valid(v):
+                    break
+
+            else:
+                return False
+
+        return True
+
+    def _check_pop(self, value, fail_fast=False):
+        """
+        Generic path for custom Key classes, which take their values from
+        a copy of the input with `Key.pop`.
+        """
         data = copy.copy(value)
         collect = {}
         errors = {}
@@ -907,40 +1846,85 @@ class Dict(ValidatorBase):
             for k, v in key.pop(data):
                 if isinstance(v, DataError):
                     errors[k] = v
+
+                    if fail_fast:
+                        raise DataError(errors)
                 else:
                     collect[k] = v
 
-        if self._soft_keys:
-            for k, v in iteritems(data):
-                item_errors = {}
+        self._check_extra(list(iteritems(data)), collect, errors, fail_fast)
 
-                for validator in self._soft_keys:
-                    try:
-                        checked_mapping = validator.check({k: v})
-                    except DataError as e:
-                        item_errors.setdefault(repr(validator), []).append(e.error[k])
+        if errors:
+            raise DataError(errors)
+
+        return collect
+
+    def _check_extra(self, items, collect, errors, fail_fast=False):
+        """
+        Check items which are not matched by hard keys against soft keys.
+        """
+        if not self._soft_keys:
+            for k, v in items:
+                errors[k] = DataError(code="not_allowed", params=(k, ))
+
+                if fail_fast:
+                    raise DataError(errors)
+
+            return
+
+        for k, v in items:
+            for mapping in self._soft_candidates(k):
+                try:
+                    if fail_fast:
+                        checked_k = mapping.validator_key.check(k, True)
+                        checked_v = mapping.validator_value.check(v, True)
                     else:
-                        k, v = next(iteritems(checked_mapping))
-                        collect[k] = v
-                        break
+                        checked_k = mapping.validator_key.check(k)
+                        checked_v = mapping.validator_value.check(v)
+                except DataError:
+                    continue
 
-                else:
-                    for sncl_repr, err_lst in iteritems(item_errors):
-                        if len(err_lst) == 1:
-                            item_errors[sncl_repr] = err_lst[0]
-                        else:
-                            item_errors[sncl_repr] = DataError(dict(enumerate(err_lst)))
+                collect[checked_k] = checked_v
+                break
+
+            else:
+                errors[k] = self._soft_error(k, v, fail_fast)
 
-                    errors[k] = DataError(item_errors)
+                if fail_fast:
+                    raise DataError(errors)
 
-        else:
-            for key in data:
-                errors[key] = DataError("{0!r} is not allowed key".format(key))
+    def _soft_candidates(self, key):
+        """
+        Soft keys which may accept the key, in declaration order. Others
+        would fail on the key validator anyway.
+        """
+        try:
+            filters = self._soft_by_type[key.__class__]
+        except KeyError:
+            filters = tuple(
+                (mapping, values) for mapping, types, values in self._soft_filters
+                if types is None or isinstance(key, types)
+            )
+            self._soft_by_type[key.__class__] = filters
 
-        if errors:
-            raise DataError(errors)
+        return [mapping for mapping, values in filters if values is None or key in values]
 
-        return collect
+    def _soft_error(self, k, v, fail_fast=False):
+        item_errors = []
+
+        for validator in self._soft_keys:
+            try:
+                validator.check({k: v}, True) if fail_fast else validator.check({k: v})
+            except DataError as e:
+                item_errors.append((validator, e.error[k]))
+
+        return DataError(code="variants", params=(item_errors, ))
+
+    def _input_types(self):
+        if self._overrides(Dict, "_check"):
+            return None
+
+        return (dict, )
 
     def keys_names(self):
         for key in self._hard_keys:
@@ -974,13 +1958,15 @@ class Mapping(ValidatorBase):
     {2: {'key': 'value is not a string', 'value': 'value cannot be converted to int'}}
     """
 
+    __slots__ = ("validator_key", "validator_value")
+
     def __init__(self, key, value):
         super(Mapping, self).__init__()
 
         self.validator_key = self._ensure_validator(key)
         self.validator_value = self._ensure_validator(value)
 
-    def _check(self, mapping):
+    def _check(self, mapping, fail_fast=False):
         checked_mapping = {}
         errors = {}
 
@@ -988,17 +1974,29 @@ class Mapping(ValidatorBase):
             pair_errors = {}
 
             try:
-                checked_key = self.validator_key.check(key)
+                if fail_fast:
+                    checked_key = self.validator_key.check(key, True)
+                else:
+                    checked_key = self.validator_key.check(key)
             except DataError as err:
                 pair_errors["key"] = err
 
+                if fail_fast:
+                    raise DataError({key: DataError(pair_errors)})
+
             try:
-                checked_value = self.validator_value.check(value)
+                if fail_fast:
+                    checked_value = self.validator_value.check(value, True)
+                else:
+                    checked_value = self.validator_value.check(value)
             except DataError as err:
                 pair_errors["value"] = err
 
             if pair_errors:
                 errors[key] = DataError(pair_errors)
+
+                if fail_fast:
+                    break
             else:
                 checked_mapping[checked_key] = checked_value
 
@@ -1007,6 +2005,26 @@ class Mapping(ValidatorBase):
 
         return checked_mapping
 
+    def check_parallel(self, value, executor=None, chunksize=10000):
+        """
+        Same as `check`, but pairs are checked in chunks in a process pool,
+        see `List.check_parallel`.
+        """
+        return _module("parallel").check_mapping(self, value, executor, chunksize)
+
+    def _check_fail_fast(self, mapping):
+        if self._overrides(Mapping, "_check"):
+            return self._check(mapping)
+
+        return self._check(mapping, True)
+
+    def _is_valid(self, mapping):
+        for key, value in iteritems(mapping):
+            if not (self.validator_key.is_valid(key) and self.validator_value.is_valid(value)):
+                return False
+
+        return True
+
     def repr(self, memo):
         return "<{0}({1} => {2})>".format(
             self.__class__.__name__,
@@ -1027,21 +2045,112 @@ class Enum(ValidatorBase):
     1
     >>> extract_error(validator, 2)
     'value does not match any variant'
+
+    Variants are looked up in a hash table, so equal values match as with
+    ``in``: ``True`` matches ``1``. With `normalize` the variant which is
+    equal to the normalized value is returned, `ignore_case` normalizes
+    strings to lower case.
+    >>> Enum("USD", "EUR", ignore_case=True).check("usd")
+    'USD'
     """
 
-    def __init__(self, *args):
+    __slots__ = ("variants", "normalize", "_index", "_unhashable")
+
+    def __init__(self, *args, **kwargs):
+        normalize = kwargs.pop("normalize", None)
+
+        if kwargs.pop("ignore_case", False):
+            if normalize is not None:
+                raise TypeError("ignore_case and normalize can't be used together")
+
+            normalize = _fold_case
+
+        if kwargs:
+            raise TypeError("unexpected keyword arguments: {0}".format(", ".join(sorted(kwargs))))
+
         super(Enum, self).__init__()
 
         self.variants = args
+        self.normalize = normalize
+
+        # normalized variant -> the first such variant
+        self._index = {}
+        self._unhashable = []
+
+        for variant in args:
+            key = variant if normalize is None else normalize(variant)
+
+            try:
+                self._index.setdefault(key, variant)
+            except TypeError:
+                self._unhashable.append((key, variant))
+
+        self._unhashable = tuple(self._unhashable)
+
+    @classmethod
+    def from_iterable(cls, iterable, **kwargs):
+        """
+        Makes Enum of variants from iterable, like lines of a file with
+        codes, takes the keyword arguments of `Enum`.
+        """
+        return cls(*iterable, **kwargs)
 
     def _check(self, value):
-        if value not in self.variants:
-            raise DataError("value does not match any variant")
+        variant = self._find(value)
 
-        return value
+        if variant is Undefined:
+            raise DataError(code="not_variant")
+
+        return value if self.normalize is None else variant
+
+    def _find(self, value):
+        """
+        Returns the variant equal to value, or Undefined.
+        """
+        key = value if self.normalize is None else self.normalize(value)
+
+        try:
+            variant = self._index.get(key, Undefined)
+        except TypeError:
+            # unhashable value may still be equal to hashable variant
+            for other, variant in iteritems(self._index):
+                if other == key:
+                    return variant
+        else:
+            if variant is not Undefined or not self._unhashable:
+                return variant
+
+        for other, variant in self._unhashable:
+            if other == key:
+                return variant
+
+        return Undefined
+
+    def _is_valid(self, value):
+        return self._find(value) is not Undefined
+
+    def _input_values(self):
+        if self._overrides(Enum, "_check", "_find") or self.normalize is not None or self._unhashable:
+            return None
+
+        return frozenset(self._index)
 
     def repr(self, memo):
-        return "<{0}({1})>".format(self.__class__.__name__, ", ".join(map(repr, self.variants)))
+        args = list(map(repr, self.variants))
+
+        if self.normalize is _fold_case:
+            args.append("ignore_case")
+        elif self.normalize is not None:
+            args.append("normalize={0!r}".format(self.normalize))
+
+        return "<{0}({1})>".format(self.__class__.__name__, ", ".join(args))
+
+
+def _fold_case(value):
+    if isinstance(value, string_types):
+        return value.lower()
+
+    return value
 
 
 class Callable(ValidatorBase):
@@ -1053,12 +2162,17 @@ class Callable(ValidatorBase):
     'value is not callable'
     """
 
+    __slots__ = ()
+
     def _check(self, value):
         if not callable(value):
-            raise DataError("value is not callable")
+            raise DataError(code="not_callable")
 
         return value
 
+    def _is_valid(self, value):
+        return callable(value)
+
 
 class Call(ValidatorBase):
 
@@ -1077,6 +2191,8 @@ class Call(ValidatorBase):
     'I want only foo!'
     """
 
+    __slots__ = ("function", )
+
     def __init__(self, function):
         super(Call, self).__init__()
 
@@ -1109,12 +2225,26 @@ class Forward(ValidatorBase):
     >>> node.check({"name": "foo", "children": [{"name": "bar", "children": []} ]}) == \\
     ... {'children': [{'children': [], 'name': 'bar'}], 'name': 'foo'}
     True
+
+    Data nested too deep for recursion is checked again with an explicit
+    stack of Forward, Dict, Mapping, List, Tuple and Or nodes, so data of
+    any depth can be checked (converters of the nodes may be called again
+    then). If the Forward can be reached again through other validators,
+    RecursionError is raised instead. With `max_depth`, which limits how
+    deep dicts, lists and tuples may nest, the stack is always used.
+    >>> limited = Forward(max_depth=1)
+    >>> limited << List(limited)
+    >>> extract_error(limited, [[]])
+    {0: 'value is nested deeper than 1'}
     """
 
-    def __init__(self):
+    __slots__ = ("validator", "max_depth")
+
+    def __init__(self, max_depth=None):
         super(Forward, self).__init__()
 
         self.validator = None
+        self.max_depth = max_depth
 
     def __lshift__(self, validator):
         self.provide(validator)
@@ -1125,11 +2255,56 @@ class Forward(ValidatorBase):
 
         self.validator = self._ensure_validator(validator)
 
-    def _check(self, value):
+    def _check(self, value, fail_fast=False):
         if self.validator is None:
             raise RuntimeError("validator for Forward is not specified")
 
-        return self.validator.check(value)
+        if _profiled and _profiler.get() is not None:
+            # every node is checked by `check` while it is profiled
+            return self.validator.check(value, True) if fail_fast else self.validator.check(value)
+
+        if self.max_depth is not None:
+            return _walk(self.validator, value, fail_fast, self.max_depth)
+
+        # recursion is faster, the stack is used only for too deep data, by
+        # the innermost Forward which leaves room for the checks of leaves;
+        # RecursionError of the stack is final, so enclosing Forward nodes
+        # don't check the same data again
+        try:
+            return self.validator.check(value, True) if fail_fast else self.validator.check(value)
+        except _TooDeep:
+            raise
+        except RecursionError:
+            if not _has_frames(_WALK_FRAMES):
+                raise
+
+            if not _walkable(self.validator):
+                raise _TooDeep("value is nested too deep to be checked")
+
+        try:
+            return _walk(self.validator, value, fail_fast, None)
+        except RecursionError:
+            raise _TooDeep("value is nested too deep to be checked")
+
+    def _check_fail_fast(self, value):
+        if self._overrides(Forward, "_check"):
+            return self._check(value)
+
+        return self._check(value, True)
+
+    def _is_valid(self, value):
+        if self.validator is None:
+            raise RuntimeError("validator for Forward is not specified")
+
+        if self.max_depth is not None:
+            try:
+                self._check(value, True)
+            except DataError:
+                return False
+
+            return True
+
+        return self.validator.is_valid(value)
 
     def repr(self, memo):
         if memo.get(id(self)):
@@ -1139,10 +2314,702 @@ class Forward(ValidatorBase):
 
         return "<Forward({0})>".format(self.validator.repr(memo))
 
+    def __rshift__(self, other):
+        # the new validator must follow `provide` of this one, so it refers
+        # to this one instead of copying it
+        obj = self.__class__(self.max_depth)
+        obj.validator = self
+        obj.append(other)
+        return obj
+
     def __deepcopy__(self, memo):  # pylint: disable=W0613
         return self
 
 
+# Iterative checking of Forward trees. Nodes are generators which yield
+# (validator, value) to check a child and get its result, or get its
+# DataError thrown in. They yield (_DONE, result) when they are done.
+
+_DONE = object()
+_WALKED = frozenset((Forward, Dict, Mapping, List, Tuple, Or))
+
+# frames left for `_walk` and the checks of the nodes it doesn't walk
+_WALK_FRAMES = 100
+
+
+class _TooDeep(RecursionError):
+
+    """
+    Data is too deep both for recursion and for the explicit stack.
+    """
+
+
+def _walk(validator, value, fail_fast, max_depth):
+    """
+    Checks value like `validator.check` does, with explicit stack of nodes.
+    """
+    stack = []
+    depth = 0
+    request = (validator, value)
+    result = error = None
+
+    while True:
+        if request is not None:
+            node, item = request
+            request = None
+            steps, nested = _steps(node, item, fail_fast)
+
+            if steps is None:
+                try:
+                    result, error = node.check(item, True) if fail_fast else node.check(item), None
+                except DataError as err:
+                    result, error = None, err
+
+            elif nested and max_depth is not None and depth >= max_depth:
+                result, error = None, DataError(code="max_depth", params=(max_depth, ))
+
+            else:
+                depth += nested
+                stack.append((node, steps, nested))
+                result = error = None
+
+        if not stack:
+            if error is not None:
+                raise error
+
+            return result
+
+        node, steps, nested = stack[-1]
+
+        try:
+            if error is None:
+                step = steps.send(result)
+            else:
+                step = steps.throw(error)
+        except DataError as err:
+            result, error = None, err
+        else:
+            if step[0] is not _DONE:
+                request = step
+                continue
+
+            try:
+                result, error = node._converted(step[1]), None
+            except DataError as err:
+                result, error = None, err
+
+        stack.pop()
+        depth -= nested
+
+
+def _steps(validator, value, fail_fast):
+    """
+    Returns (generator or None, 1 if it is a container or 0) for validator.
+    Validators which are not walked are checked by `check`.
+    """
+    if not _walked(validator):
+        return None, 0
+
+    cls = validator.__class__
+
+    if cls is Forward:
+        return _forward_steps(validator, value), 0
+
+    if cls is Dict:
+        return _dict_steps(validator, value, fail_fast), 1
+
+    if cls is Mapping:
+        return _mapping_steps(validator, value, fail_fast), 1
+
+    if cls is List:
+        return _list_steps(validator, value, fail_fast), 1
+
+    if cls is Tuple:
+        return _tuple_steps(validator, value, fail_fast), 1
+
+    return _or_steps(validator, value, fail_fast), 0
+
+
+def _walked(validator):
+    """
+    Checks if nodes walk validator, instead of calling its `check`.
+    Subclasses are not walked.
+    """
+    cls = validator.__class__
+
+    if cls not in _WALKED:
+        return False
+
+    if cls is Dict:
+        return validator._simple_keys
+
+    if cls is Forward:
+        return validator.validator is not None
+
+    return True
+
+
+def _has_frames(count):
+    """
+    Checks if count more frames fit under the recursion limit, by counting
+    the frames of the stack.
+    """
+    frame = inspect.currentframe()
+    depth = 0
+
+    while frame is not None:
+        depth += 1
+        frame = frame.f_back
+
+    return depth + count <= sys.getrecursionlimit()
+
+
+def _walkable(validator):
+    """
+    Checks if nodes walk every validator through which validator may reach
+    a Forward, so the stack never recurses.
+    """
+    seen = set()
+    stack = [validator]
+
+    while stack:
+        node = stack.pop()
+
+        if id(node) in seen:
+            continue
+
+        seen.add(id(node))
+
+        if _walked(node):
+            stack.extend(_children(node))
+        elif _reaches_forward(node):
+            return False
+
+    return True
+
+
+def _children(validator):
+    """
+    Child validators of a walked validator.
+    """
+    cls = validator.__class__
+
+    if cls is Forward or cls is List:
+        return (validator.validator, )
+
+    if cls is Mapping:
+        return (validator.validator_key, validator.validator_value)
+
+    if cls is Dict:
+        children = [key.validator for key in validator._hard_keys]
+
+        for mapping in validator._soft_keys:
+            children.extend((mapping, mapping.validator_key, mapping.validator_value))
+
+        return children
+
+    return validator.validators
+
+
+def _reaches_forward(validator):
+    """
+    Checks if any of the attributes of validator, of its keys and of its
+    children is a Forward.
+    """
+    seen = set()
+    stack = [validator]
+
+    while stack:
+        obj = stack.pop()
+
+        if isinstance(obj, Forward):
+            return True
+
+        if id(obj) in seen:
+            continue
+
+        seen.add(id(obj))
+
+        if isinstance(obj, (ValidatorBase, Key)):
+            stack.extend(value for name, value in _attributes(obj))
+        elif isinstance(obj, (list, tuple)):
+            stack.extend(obj)
+
+    return False
+
+
+def _forward_steps(validator, value):
+    yield _DONE, (yield validator.validator, value)
+
+
+def _list_steps(validator, value, fail_fast):
+    # the same as List._check
+    if not isinstance(value, list):
+        raise DataError(code="not_list")
+
+    if len(value) < validator.min_length:
+        raise DataError(code="min_length", params=(validator.min_length, ))
+
+    if validator.max_length is not None and len(value) > validator.max_length:
+        raise DataError(code="max_length", params=(validator.max_length, ))
+
+    item_validator = validator.validator
+    check = None if _walked(item_validator) else item_validator.check
+    result = []
+    errors = {}
+
+    for index, item in enumerate(value):
+        try:
+            if check is None:
+                result.append((yield item_validator, item))
+            else:
+                result.append(check(item, True) if fail_fast else check(item))
+        except DataError as err:
+            errors[index] = err
+
+            if fail_fast:
+                break
+
+    if errors:
+        raise DataError(errors)
+
+    yield _DONE, result
+
+
+def _tuple_steps(validator, value, fail_fast):
+    # the same as Tuple._check
+    try:
+        value = tuple(value)
+    except TypeError:
+        raise DataError(code="not_tuple")
+
+    length = len(validator.validators)
+
+    if len(value) != length:
+        raise DataError(code="tuple_length", params=(length, ))
+
+    result = []
+    errors = {}
+
+    for idx, (item, item_validator) in enumerate(zip(value, validator.validators)):
+        try:
+            if _walked(item_validator):
+                result.append((yield item_validator, item))
+            elif fail_fast:
+                result.append(item_validator.check(item, True))
+            else:
+                result.append(item_validator.check(item))
+        except DataError as err:
+            errors[idx] = err
+
+            if fail_fast:
+                break
+
+    if errors:
+        raise DataError(errors)
+
+    yield _DONE, tuple(result)
+
+
+def _dict_steps(validator, value, fail_fast):
+    # the same as Dict._check with simple keys
+    if not isinstance(value, dict):
+        raise DataError(code="not_dict")
+
+    collect = {}
+    errors = {}
+    present = 0
+
+    for key in validator._hard_keys:
+        name = key.name
+
+        if name in value:
+            present += 1
+            item = value[name]
+
+        elif key.optional:
+            continue
+
+        elif key.default is not Undefined:
+            item = key.default() if callable(key.default) else key.default
+
+        else:
+            errors[name] = DataError(code="required")
+
+            if fail_fast:
+                raise DataError(errors)
+
+            continue
+
+        item_validator = key.validator
+
+        try:
+            if _walked(item_validator):
+                collect[key.to_name or name] = yield item_validator, item
+            elif fail_fast:
+                collect[key.to_name or name] = item_validator.check(item, True)
+            else:
+                collect[key.to_name or name] = item_validator.check(item)
+        except DataError as err:
+            errors[key.to_name or name] = err
+
+            if fail_fast:
+                raise DataError(errors)
+
+    if present != len(value):
+        hard_names = validator._hard_names
+        items = [(k, v) for k, v in iteritems(value) if k not in hard_names]
+
+        if not validator._soft_keys:
+            validator._check_extra(items, collect, errors, fail_fast)
+
+        else:
+            # the same as Dict._check_extra and Dict._soft_error
+            for k, v in items:
+                for mapping in validator._soft_candidates(k):
+                    key_validator = mapping.validator_key
+                    value_validator = mapping.validator_value
+
+                    try:
+                        if _walked(key_validator):
+                            checked_k = yield key_validator, k
+                        elif fail_fast:
+                            checked_k = key_validator.check(k, True)
+                        else:
+                            checked_k = key_validator.check(k)
+
+                        if _walked(value_validator):
+                            checked_v = yield value_validator, v
+                        elif fail_fast:
+                            checked_v = value_validator.check(v, True)
+                        else:
+                            checked_v = value_validator.check(v)
+                    except DataError:
+                        continue
+
+                    collect[checked_k] = checked_v
+                    break
+
+                else:
+                    item_errors = []
+
+                    for mapping in validator._soft_keys:
+                        try:
+                            if _walked(mapping):
+                                yield mapping, {k: v}
+                            elif fail_fast:
+                                mapping.check({k: v}, True)
+                            else:
+                                mapping.check({k: v})
+                        except DataError as err:
+                            item_errors.append((mapping, err.error[k]))
+
+                    errors[k] = DataError(code="variants", params=(item_errors, ))
+
+                    if fail_fast:
+                        raise DataError(errors)
+
+    if errors:
+        raise DataError(errors)
+
+    yield _DONE, collect
+
+
+def _mapping_steps(validator, value, fail_fast):
+    # the same as Mapping._check
+    key_validator = validator.validator_key
+    value_validator = validator.validator_value
+    checked_mapping = {}
+    errors = {}
+
+    for key, item in iteritems(value):
+        pair_errors = {}
+
+        try:
+            if _walked(key_validator):
+                checked_key = yield key_validator, key
+            elif fail_fast:
+                checked_key = key_validator.check(key, True)
+            else:
+                checked_key = key_validator.check(key)
+        except DataError as err:
+            pair_errors["key"] = err
+
+            if fail_fast:
+                raise DataError({key: DataError(pair_errors)})
+
+        try:
+            if _walked(value_validator):
+                checked_value = yield value_validator, item
+            elif fail_fast:
+                checked_value = value_validator.check(item, True)
+            else:
+                checked_value = value_validator.check(item)
+        except DataError as err:
+            pair_errors["value"] = err
+
+        if pair_errors:
+            errors[key] = DataError(pair_errors)
+
+            if fail_fast:
+                break
+        else:
+            checked_mapping[checked_key] = checked_value
+
+    if errors:
+        raise DataError(errors)
+
+    yield _DONE, checked_mapping
+
+
+def _or_steps(validator, value, fail_fast):
+    # the same as Or._check
+    validators = validator.validators
+    ranking = validator._ranking
+
+    if validator._by_type is not None:
+        candidates = validator._candidates(value)
+    else:
+        candidates = range(len(validators))
+
+    order = ranking.order if ranking is not None else candidates
+    errors = {}
+
+    for index in order:
+        if ranking is not None and index not in candidates:
+            continue
+
+        variant = validators[index]
+
+        try:
+            if _walked(variant):
+                result = yield variant, value
+            else:
+                result = variant.check(value, True) if fail_fast else variant.check(value)
+        except DataError as err:
+            errors[index] = err
+        else:
+            if ranking is not None:
+                ranking.hit(index)
+
+            yield _DONE, result
+            return
+
+    collected = []
+
+    for index, variant in enumerate(validators):
+        error = errors.get(index)
+
+        if error is None:
+            try:
+                if _walked(variant):
+                    result = yield variant, value
+                else:
+                    result = variant.check(value, True) if fail_fast else variant.check(value)
+            except DataError as err:
+                error = err
+            else:
+                yield _DONE, result
+                return
+
+        collected.append((variant, error))
+
+    raise DataError(code="variants", params=(collected, ))
+
+
+_FREEZE_DEPTH = 100
+
+_IMMUTABLE = frozenset(integer_types + (text_type, binary_type, str, float, complex, bool,
+                                        Decimal, type(None)))
+
+
+def _freeze(value, depth=_FREEZE_DEPTH):
+    """
+    Hashable cache key of value which keeps equal values of different types
+    (1, 1.0 and True) apart. Dicts, lists and tuples are frozen item by
+    item. Raises TypeError for unhashable values and values nested deeper
+    than `_FREEZE_DEPTH`.
+    """
+    cls = value.__class__
+
+    if cls is dict or cls is list or cls is tuple:
+        if not depth:
+            raise TypeError("value is nested too deep to be cached")
+
+        if cls is dict:
+            return cls, frozenset((_freeze(k, depth - 1), _freeze(v, depth - 1))
+                                  for k, v in iteritems(value))
+
+        return cls, tuple(_freeze(item, depth - 1) for item in value)
+
+    hash(value)
+
+    return cls, value
+
+
+def _copied(value):
+    # checked values may be changed by callers, so the cache keeps its own
+    return value if value.__class__ in _IMMUTABLE else copy.deepcopy(value)
+
+
+_monotonic = getattr(time, "monotonic", time.time)
+
+CacheInfo = namedtuple("CacheInfo", ("hits", "misses", "maxsize", "currsize"))
+
+
+class _Memo(object):
+
+    """
+    Thread-safe LRU cache of results and errors of checks, entries expire
+    after `ttl` seconds if it is given.
+    """
+
+    def __init__(self, maxsize, ttl):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.entries = OrderedDict()
+        self.lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def call(self, key, function, *args):
+        now, entry = self.get(key)
+
+        if entry is not None:
+            return self.replay(entry)
+
+        try:
+            result = function(*args)
+        except DataError as err:
+            self.store(key, now, None, err)
+            raise
+
+        self.store(key, now, result, None)
+
+        return result
+
+    def get(self, key):
+        """
+        Returns (now, entry), entry is None if key is not cached.
+        """
+        now = _monotonic() if self.ttl is not None else None
+
+        with self.lock:
+            entry = self.entries.pop(key, None)
+
+            if entry is not None and (now is None or entry[0] > now):
+                self.entries[key] = entry
+                self.hits += 1
+            else:
+                entry = None
+                self.misses += 1
+
+        return now, entry
+
+    @staticmethod
+    def replay(entry):
+        """
+        Returns the result of cached entry, or raises its error.
+        """
+        expires, result, error = entry
+
+        if error is not None:
+            raise DataError(*error)
+
+        return _copied(result)
+
+    def store(self, key, now, result, error):
+        """
+        Stores result, or DataError without its traceback, which keeps
+        frames and checked values alive.
+        """
+        result = _copied(result)
+
+        if error is not None:
+            error = (error._error, error.code, error.params)
+
+        with self.lock:
+            self.entries[key] = (now + self.ttl if now is not None else None, result, error)
+
+            if len(self.entries) > self.maxsize:
+                self.entries.popitem(last=False)
+
+    def __getstate__(self):
+        # a pickled validator (e.g. sent to a process pool) starts empty
+        return self.maxsize, self.ttl
+
+    def __setstate__(self, state):
+        self.__init__(*state)
+
+    def info(self):
+        return CacheInfo(self.hits, self.misses, self.maxsize, len(self.entries))
+
+    def clear(self):
+        with self.lock:
+            self.entries.clear()
+            self.hits = 0
+            self.misses = 0
+
+
+class Cached(ValidatorBase):
+
+    """
+    Memoizes results of validator, both checked values and errors, for
+    hashable values and dicts, lists and tuples of them. Other values are
+    just checked. Least recently used results are evicted when there are
+    more than `maxsize` of them, and results expire after `ttl` seconds if
+    it is given. Each call gets its own copy of a mutable checked value.
+
+    >>> validator = Cached(Int, maxsize=100)
+    >>> validator.check("1"), validator.check("1")
+    (1, 1)
+    >>> extract_error(validator, "a")
+    'value cannot be converted to int'
+    >>> validator.cache_info()
+    CacheInfo(hits=1, misses=2, maxsize=100, currsize=2)
+    """
+
+    __slots__ = ("validator", "_memo")
+
+    def __init__(self, validator, maxsize=1024, ttl=None):
+        super(Cached, self).__init__()
+
+        self.validator = self._ensure_validator(validator)
+        self._memo = _Memo(maxsize, ttl)
+
+    def _check(self, value, fail_fast=False):
+        try:
+            key = (fail_fast, _freeze(value))
+        except TypeError:
+            return self.validator.check(value, True) if fail_fast else self.validator.check(value)
+
+        if fail_fast:
+            return self._memo.call(key, self.validator.check, value, True)
+
+        return self._memo.call(key, self.validator.check, value)
+
+    def _check_fail_fast(self, value):
+        if self._overrides(Cached, "_check"):
+            return self._check(value)
+
+        return self._check(value, True)
+
+    def _input_types(self):
+        return self.validator._input_types()
+
+    def _input_values(self):
+        return self.validator._input_values()
+
+    def cache_info(self):
+        return self._memo.info()
+
+    def cache_clear(self):
+        self._memo.clear()
+
+    def repr(self, memo):
+        return "<{0}({1})>".format(self.__class__.__name__, self.validator.repr(memo))
+
+
 def catch_error(validator, *args, **kwargs):
     """
     Helper for tests - catch error and return it as dict.
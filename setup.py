@@ -37,12 +37,13 @@ setup(
     extras_require=dict(
         rfc3339=("python-dateutil>=1.5", ),
         objectid=("pymongo>=2.0.0", ),
+        numpy=("numpy>=1.7", ),
     ),
     entry_points=dict(
         pinvl=(
             ".URL = pinvl.contrib.url:URL",
             ".Email = pinvl.contrib.email:Email",
-            ".DateTime = pinvl.contrib.rfc_3339:DateTime [rfc3339]",
+            ".DateTime = pinvl.contrib.rfc_3339:DateTime",
             ".MongoId = pinvl.contrib.object_id:MongoId [objectid]",
         ),
     ),
@@ -1,9 +1,25 @@
 # -*- coding: utf-8 -*-
 
-from unittest import TestCase, main
+from unittest import TestCase, main, skipIf
+import copy
+import gc
+from decimal import Decimal
+from fractions import Fraction
+import io
+import json
+import pickle
 import re
+import warnings
 from pinvl import *
-from pinvl.validators import extract_error
+from pinvl.validators import ValidatorBase, catch_error, extract_error
+from pinvl import compiler
+from pinvl.jsonstream import check_json, JSONError
+from pinvl.instrument import Profiler
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
 
 
 class PinvlTestCase(TestCase):
@@ -54,6 +70,9 @@ class PinvlTestCase(TestCase):
         self.assertEqual(vdr.check(2), 2.0)
         self.assertEqual(vdr.check("2"), 2.0)
         self.assertEqual(extract_error(vdr, "foo"), "value cannot be converted to float")
+        self.assertEqual(vdr.check(Decimal("2.5")), 2.5)
+        self.assertIsInstance(vdr.check(Decimal("2.5")), float)
+        self.assertEqual(extract_error(Float(strict=True), Decimal("2.5")), "value is not float")
 
         vdr = Float(gte=5.2)
         self.assertEqual(extract_error(vdr, 5.1), "value is less than 5.2")
@@ -81,6 +100,40 @@ class PinvlTestCase(TestCase):
         self.assertEqual(vdr.check("3"), 3)
         self.assertEqual(extract_error(vdr, 2.1), "value is not int")
 
+    def test_Int_exact(self):
+        vdr = Int()
+        self.assertEqual(vdr.check("9007199254740993"), 9007199254740993)
+        self.assertEqual(vdr.check(" -12 "), -12)
+        self.assertEqual(vdr.check("5.0"), 5)
+        self.assertEqual(vdr.check("1e3"), 1000)
+        self.assertEqual(vdr.check(5.0), 5)
+        self.assertEqual(vdr.check(Decimal("12345678901234567890.000")), 12345678901234567890)
+        self.assertEqual(vdr.check(Fraction(10, 2)), 5)
+        self.assertIs(vdr.check(True), True)
+        self.assertEqual(extract_error(vdr, "1.00000000000000001"), "value is not int")
+        self.assertEqual(extract_error(vdr, Decimal("1.5")), "value is not int")
+        self.assertEqual(extract_error(vdr, Fraction(1, 3)), "value is not int")
+        self.assertEqual(extract_error(vdr, "nan"), "value is not int")
+        self.assertEqual(extract_error(vdr, "1e100000"), "value is not int")
+        self.assertEqual(extract_error(vdr, "1__0"), "value cannot be converted to int")
+        self.assertEqual(extract_error(vdr, "²"), "value cannot be converted to int")
+        self.assertTrue(vdr.is_valid("12"))
+        self.assertFalse(vdr.is_valid("1.5"))
+
+        vdr = Int(strict=True)
+        self.assertEqual(vdr.check(3), 3)
+        self.assertEqual(extract_error(vdr, "3"), "value is not int")
+        self.assertEqual(extract_error(vdr, True), "value is not int")
+        self.assertEqual(extract_error(vdr, 3.0), "value is not int")
+        self.assertEqual(repr(Int(gte=1, strict=True)), "<Int>(gte=1, strict=True)")
+        self.assertEqual(copy.copy(Int(strict=True) > 1).check(2), 2)
+
+        vdr = Float(strict=True)
+        self.assertEqual(vdr.check(1.5), 1.5)
+        self.assertEqual(extract_error(vdr, 1), "value is not float")
+        self.assertEqual(Float().check(Decimal("1.5")), 1.5)
+        self.assertEqual(extract_error(Float(), 10 ** 400), "value cannot be converted to float")
+
     def test_Atom(self):
         vdr = Atom("foo")
         self.assertEqual(vdr.check("foo"), "foo")
@@ -101,10 +154,309 @@ class PinvlTestCase(TestCase):
         vdr = String(regex=r"[a-f]+", flags=re.I)
         self.assertEqual(vdr.check("abcDEF"), "abcDEF")
 
+    def test_structural_sharing(self):
+        items = List(Dict(a=Int))
+        vdr = Dict(items=items, name=String(regex=r"\w+"))
+        converted = vdr >> (lambda d: d["name"])
+        self.assertEqual(converted.check({"items": [], "name": "x"}), "x")
+        self.assertEqual(vdr.check({"items": [], "name": "x"}), {"items": [], "name": "x"})
+        self.assertIs(converted._hard_keys, vdr._hard_keys)
+        self.assertEqual(vdr._converters, ())
+
+        optional = vdr.make_optional("name")
+        self.assertEqual(optional.check({"items": []}), {"items": []})
+        self.assertEqual(extract_error(vdr, {"items": []}), {"name": "is required"})
+        self.assertIs(dict((key.name, key) for key in optional._hard_keys)["items"].validator, items)
+        self.assertEqual(vdr.make_optional("*").check({}), {})
+
+        key = Key("a")
+        vdr_a, vdr_b = Dict({key: Int}), Dict({key >> "b": String})
+        self.assertEqual(vdr_a.check({"a": 1}), {"a": 1})
+        self.assertEqual(vdr_b.check({"a": "x"}), {"b": "x"})
+        self.assertIs(key.to_name, None)
+
+        vdr = Int | Null
+        converted = vdr >> str
+        self.assertIsInstance(converted.validators, tuple)
+        self.assertEqual((converted | String).validators[:2], vdr.validators)
+        self.assertEqual(len(vdr.validators), 2)
+
+        vdr = Int >> str
+        self.assertEqual((vdr > 3).check(5), "5")
+        self.assertEqual(extract_error(vdr < 3, 5), "value should be less than 3")
+
+        node = Forward()
+        converted = node >> len
+        node << List(node)
+        self.assertEqual(converted.check([[], []]), 2)
+        self.assertEqual(node.check([[]]), [[]])
+
+    def test_slots(self):
+        vdr = Dict({"a": Or(Int[1:], Null), Key("b", optional=True): List(String(regex=r"^\w+$")),
+                    String: Tuple(Float, Enum(1, 2))})
+        nodes = [vdr, vdr._hard_keys[0], vdr._hard_keys[0].validator, vdr._soft_keys[0], Forward(), Atom(1)]
+
+        for node in nodes:
+            self.assertFalse(hasattr(node, "__dict__"), node)
+
+        value = {"a": "1", "b": ["x"], "c": (1, 2)}
+        for protocol in range(pickle.HIGHEST_PROTOCOL + 1):
+            self.assertEqual(pickle.loads(pickle.dumps(vdr, protocol)).check(value), vdr.check(value))
+            self.assertEqual(pickle.loads(pickle.dumps(Int[1:], protocol)).check(2), 2)
+        self.assertEqual(repr(copy.deepcopy(vdr)), repr(vdr))
+
+        regex = String(regex=r"^a+$") >> (lambda match: len(match.group()))
+        copied = copy.deepcopy(Tuple(regex, regex))
+        self.assertIs(copied.validators[0], copied.validators[1])
+        self.assertIsNot(copied.validators[0], regex)
+        self.assertEqual(copied.check(["a", "aa"]), (1, 2))
+
+    def test_Cached(self):
+        calls = []
+
+        def parse(value):
+            calls.append(value)
+
+            if value == "bad":
+                raise DataError("bad value")
+
+            return value.upper()
+
+        vdr = Cached(Call(parse), maxsize=2)
+        self.assertEqual([vdr.check(v) for v in ("a", "a", "b", "a")], ["A", "A", "B", "A"])
+        self.assertEqual(calls, ["a", "b"])
+        self.assertEqual(extract_error(vdr, "bad"), "bad value")
+        self.assertEqual(extract_error(vdr, "bad"), "bad value")
+        self.assertEqual(calls, ["a", "b", "bad"])
+        self.assertEqual(vdr.cache_info(), (3, 3, 2, 2))
+
+        vdr.check("b")  # evicted by "bad"
+        self.assertEqual(calls, ["a", "b", "bad", "b"])
+
+        vdr = Cached(List(Int) >> sum)
+        self.assertEqual(vdr.check([1, "2"]), 3)
+        self.assertEqual(vdr.check([1, "2"]), 3)
+        self.assertEqual(vdr.check([1, 2.0]), 3)
+        self.assertEqual(vdr.cache_info().hits, 1)
+        self.assertFalse(vdr.is_valid([True, "a"]))
+        self.assertEqual(Cached(Any).check({1: [set()]}), {1: [set()]})  # unhashable
+
+        vdr = Cached(List(Int))
+        vdr.check(["1"]).append(2)
+        result = vdr.check(["1"])
+        self.assertEqual(result, [1])
+        result.append(3)
+        self.assertEqual(vdr.check(["1"]), [1])
+
+        deep = []
+        for _ in range(10000):
+            deep = [deep]
+        self.assertIs(Cached(Any).check(deep), deep)  # too deep, not cached
+
+        vdr = Cached(Int)
+        catch_error(vdr, "a")
+        (_, _, error), = vdr._memo.entries.values()
+        self.assertEqual(error, (None, "cannot_convert", (int,)))  # no traceback kept
+
+        vdr = Cached(Call(parse), ttl=0)
+        vdr.check("x")
+        vdr.check("x")
+        self.assertEqual(vdr.cache_info().hits, 0)
+
+    def test_Profiler(self):
+        vdr = Dict(users=List(Dict(email=String)), pair=Tuple(Int, Int))
+        check = ValidatorBase.check
+
+        with Profiler() as profiler:
+            vdr.check({"users": [{"email": "a"}], "pair": [1, 2]})
+            catch_error(vdr, {"users": [{"email": 1}], "pair": [1, "a"]})
+
+            with Profiler() as inner:
+                Int().check(1)
+
+        self.assertEqual(ValidatorBase.check, check)
+        self.assertEqual(list(inner.stats()), ["Int"])
+        self.assertRaises(RuntimeError, profiler.disable)
+        stats = profiler.stats()
+        self.assertEqual(sorted(stats), [
+            "Dict", "Dict.pair -> Tuple", "Dict.pair -> Tuple[0] -> Int", "Dict.pair -> Tuple[1] -> Int",
+            "Dict.users -> List", "Dict.users -> List -> Dict", "Dict.users -> List -> Dict.email -> String",
+        ])
+        email = stats["Dict.users -> List -> Dict.email -> String"]
+        self.assertEqual((email["calls"], email["failures"], email["errors"]), (2, 1, {"not_string": 1}))
+        self.assertEqual(stats["Dict"]["errors"], {})
+        self.assertIn('pinvl_node_calls_total{path="Dict.pair -> Tuple[1] -> Int"} 2', profiler.prometheus())
+        self.assertIn('pinvl_node_errors_total{path="Dict.pair -> Tuple[1] -> Int",'
+                      'code="cannot_convert"} 1', profiler.prometheus())
+
+        profiler = Profiler()
+        for value in ({"a": 1, "x": 1}, {"a": "b", "y": 2}, {"z": 3}):
+            self.assertRaises(DataError, profiler.check, Dict(a=Int | Null), value)
+
+        self.assertEqual(profiler.stats()["Dict"]["errors"], {"not_allowed": 3, "required": 1})
+        self.assertEqual(profiler.stats()["Dict.a -> Or"]["errors"], {"variants": 1})
+
+        node = Forward()
+        node << Dict(name=String, children=List(node))
+        value = {"name": "leaf", "children": []}
+        for _ in range(100):
+            value = {"name": 1, "children": [value]}
+
+        with Profiler() as profiler:
+            catch_error(node, value)
+
+        stats = profiler.stats()
+        self.assertEqual(sorted(stats), [
+            "Forward", "Forward -> Dict", "Forward -> Dict.children -> List", "Forward -> Dict.name -> String",
+        ])
+        self.assertEqual(stats["Forward -> Dict.name -> String"]["errors"], {"not_string": 100})
+        self.assertEqual(stats["Forward"]["calls"], 101)
+
+        import threading
+
+        thread = threading.Thread(target=Int().check, args=(1, ))
+        with Profiler() as profiler:
+            thread.start()
+            thread.join()
+        self.assertEqual(profiler.stats(), {})  # other threads are not profiled
+
+    def test_check_parallel(self):
+        from concurrent.futures import ThreadPoolExecutor
+        from pinvl import parallel
+
+        vdr = List(Dict(id=Int, score=Float[0:1] | Null), max_length=100)
+        rows = [{"id": str(i), "score": i / 100.0} for i in range(50)]
+        rows[7]["id"] = "x"
+        rows[42]["score"] = 2
+
+        def parallel_error(vdr, value, **kwargs):
+            with self.assertRaises(DataError) as cm:
+                vdr.check_parallel(value, **kwargs)
+
+            return cm.exception.as_dict()
+
+        with ThreadPoolExecutor(2) as executor:
+            self.assertEqual(vdr.check_parallel(rows[:7], executor=executor, chunksize=3), vdr.check(rows[:7]))
+            self.assertEqual(parallel_error(vdr, rows, executor=executor, chunksize=8), extract_error(vdr, rows))
+            self.assertEqual(parallel_error(vdr, rows * 3, executor=executor), "list length is greater than 100")
+
+            vdr = Mapping(String, Cached(Int))
+            value = dict((str(i), str(i)) for i in range(20))
+            self.assertEqual(vdr.check_parallel(value, executor=executor, chunksize=6), vdr.check(value))
+            value["x"] = "y"
+            self.assertEqual(parallel_error(vdr, value, executor=executor, chunksize=6),
+                             extract_error(vdr, value))
+
+            for maximum in range(1, 21):
+                self.assertEqual(List(Int[:maximum]).check_parallel([0, 1], executor=executor, chunksize=1),
+                                 [0, 1])
+            self.assertLessEqual(len(parallel._validators), parallel._MAX_VALIDATORS)
+
+        self.assertEqual(List(Int).check_parallel(["1", 2, "3"], chunksize=2), [1, 2, 3])  # own pool
+
+    def test_async_check(self):
+        import asyncio
+
+        def later(value):
+            return asyncio.sleep(0.01, result=value)
+
+        def unique(value):
+            if value == "dup":
+                raise DataError("already exists")
+
+            return later(value.upper())
+
+        vdr = Dict({Key("name") >> "n": Call(unique), String: Int >> later},
+                   ids=List(Int >> later, max_length=50), pair=Tuple(Int, Call(unique)),
+                   map=Mapping(String, Float >> later), alt=Null | (Int >> later))
+        value = {"name": "a", "ids": [str(i) for i in range(40)], "pair": ("1", "b"),
+                 "map": {"x": 1}, "alt": "3", "extra": "5"}
+        expected = {"n": "A", "ids": list(range(40)), "pair": (1, "B"), "map": {"x": 1.0}, "alt": 3, "extra": 5}
+
+        self.assertEqual(asyncio.run(vdr.async_check(value)), expected)
+        self.assertEqual(asyncio.run(vdr.async_check(value, concurrency=4)), expected)
+
+        with self.assertRaises(DataError) as cm:
+            asyncio.run(vdr.async_check(dict(value, name="dup", ids=[1, "x"], alt="z", other=None)))
+
+        self.assertEqual(cm.exception.as_dict(), {
+            "n": "already exists",
+            "ids": {1: "value cannot be converted to int"},
+            "alt": {"<Null>": "value should be None", "<Int>": "value cannot be converted to int"},
+            "other": {"<Mapping(<String> => <Int>)>": {"value": "value cannot be converted to int"}},
+        })
+
+        vdr = Dict(ids=List(Int), name=String) >> (lambda d: sorted(d))
+        self.assertEqual(asyncio.run(vdr.async_check({"ids": [1], "name": "x"})), vdr.check({"ids": [1], "name": "x"}))
+
+        class Items(List):
+            pass
+
+        self.assertEqual(asyncio.run(Items(Call(later)).async_check([1, 2])), [1, 2])
+
+        calls = []
+
+        def counted(value):
+            calls.append(value)
+            return later(value)
+
+        vdr = Cached(Call(counted))
+        self.assertEqual([asyncio.run(vdr.async_check(v)) for v in (1, 1, 2)], [1, 1, 2])
+        self.assertEqual(calls, [1, 2])
+        self.assertEqual(vdr.cache_info().hits, 1)
+
+        vdr = Dict({Int: Call(unique), String: Int >> later})
+        with warnings.catch_warnings(record=True) as caught:
+            warnings.simplefilter("always")
+
+            with self.assertRaises(DataError) as cm:
+                asyncio.run(vdr.async_check({"k": "x"}))
+
+            error = cm.exception.as_dict()
+            del cm  # its traceback keeps frames alive
+            gc.collect()  # an unawaited coroutine warns when it is collected
+
+        self.assertEqual(caught, [])
+        self.assertEqual(error, {"k": {
+            "<Mapping(<Int> => <Call(unique)>)>": {"key": "value cannot be converted to int"},
+            "<Mapping(<String> => <Int>)>": {"value": "value cannot be converted to int"},
+        }})
+
+    def test_contrib(self):
+        import pinvl
+        from pinvl.contrib.url import URL as ContribURL
+
+        self.assertIs(pinvl.URL, ContribURL)
+        self.assertIn("Email", pinvl.__all__)
+        self.assertIn("DateTime", dir(pinvl))
+        self.assertFalse(hasattr(pinvl, "NoSuchValidator"))
+
+    def test_DateTime(self):
+        from datetime import datetime, timedelta, timezone
+
+        vdr = DateTime()
+        moment = datetime(2017, 5, 12, 10, 20, 30, 500000, timezone(timedelta(hours=3)))
+        self.assertEqual(vdr.check("2017-05-12T10:20:30.5+03:00"), moment)
+        self.assertEqual(vdr.check("2017-05-12t07:20:30.5000001z"), moment)
+        self.assertEqual(vdr.check("2017-05-12 07:20:30.5-00:00"), moment)
+        self.assertIs(vdr.check(moment), moment)
+        self.assertEqual(extract_error(vdr, "2017-05-12T10:20:30"), "value cannot be parsed as date")
+        self.assertEqual(extract_error(vdr, "2017-02-30T10:20:30Z"), "value cannot be parsed as date")
+        self.assertEqual(extract_error(vdr, 1), "value cannot be converted to datetime")
+        self.assertFalse(vdr.is_valid("12 May 2017"))
+        self.assertEqual(catch_error(vdr, "2017-02-30T10:20:30Z").code, "not_date")
+        self.assertFalse(vdr.is_valid(u"\u0662017-05-12T10:20:30Z"))  # arabic-indic digit
+
     def test_Email(self):
         vdr = Email()
         self.assertEqual(vdr.check("someone@example.net"), "someone@example.net")
         self.assertEqual(extract_error(vdr, "foo"), "value is not a valid email address")
+        self.assertEqual(vdr.check(u"someone@пример.рф"), "someone@xn--e1afmkfd.xn--p1ai")
+        self.assertEqual(vdr.check(b"someone@example.net"), "someone@example.net")
+        self.assertEqual(vdr.check('"some@one"@example.net'), '"some@one"@example.net')
+
+        for value in ("x" * 65 + "@example.net", "someone@example", u"sоmeone@example.net", "@example.net", 1):
+            self.assertEqual(extract_error(vdr, value), "value is not a valid email address")
 
     def test_URL(self):
         vdr = URL()
@@ -114,6 +466,10 @@ class PinvlTestCase(TestCase):
         url = u"http://пример.рф/resource/?param=value#anchor"
         url_out = u"http://xn--e1afmkfd.xn--p1ai/resource/?param=value#anchor"
         self.assertEqual(vdr.check(url), url_out)
+        self.assertEqual(vdr.check(url.encode("utf-8")), url_out)
+
+        for value in ("example.net", "http://exam ple.net", u"http://пример..рф", 1):
+            self.assertEqual(extract_error(vdr, value), "value is not a valid URL")
 
     def test_List(self):
         vdr = List(Int)
@@ -243,6 +599,47 @@ class PinvlTestCase(TestCase):
         }
         self.assertEqual(extract_error(vdr, {"35": "abc", "test": 16}), err)
 
+    def test_Dict_soft_keys_dispatch(self):
+        vdr = Dict({
+            Enum("foo", "bar"): Int,
+            Atom("host"): String,
+            Int: Float,
+            String(regex=r"^x\w*"): Any,
+        })
+        self.assertEqual(vdr.check({"foo": 1, "host": "spam", 5: 1, "xyz": None}),
+                         {"foo": 1, "host": "spam", 5: 1.0, "xyz": None})
+        self.assertEqual(vdr._soft_candidates(5), [vdr._soft_keys[2]])
+        self.assertEqual(vdr._soft_candidates("foo"),
+                         [vdr._soft_keys[0], vdr._soft_keys[2], vdr._soft_keys[3]])
+        self.assertEqual(extract_error(vdr, {"foo": "spam"}), {
+            "foo": {
+                "<Mapping(<Enum('foo', 'bar')> => <Int>)>": {"value": "value cannot be converted to int"},
+                "<Mapping(<Atom> => <String>)>": {"key": "value is not exactly 'host'"},
+                "<Mapping(<Int> => <Float>)>": {"key": "value cannot be converted to int",
+                                                "value": "value cannot be converted to float"},
+                "<Mapping(<String(<regex>)> => <Any>)>": {"key": "value does not match pattern"},
+            }
+        })
+
+    def test_Dict_custom_key(self):
+        class KeysSubset(Key):
+            def __init__(self, *names):
+                super(KeysSubset, self).__init__(names[0])
+                self.names = names
+
+            def pop(self, data):
+                yield self.name, " ".join(data.pop(name) for name in self.names)
+
+            def keys_names(self):
+                return iter(self.names)
+
+        vdr = Dict({KeysSubset("first", "last"): Any})
+        value = {"first": "John", "last": "Smith"}
+        self.assertEqual(vdr.check(value), {"first": "John Smith"})
+        self.assertEqual(value, {"first": "John", "last": "Smith"})
+        self.assertEqual(extract_error(vdr, {"first": "John", "last": "Smith", "foo": 1}),
+                         {"foo": "'foo' is not allowed key"})
+
     def test_Mapping(self):
         vdr = Mapping(String, Int)
         self.assertEqual(vdr.check({"foo": 1, "bar": 2}), {"foo": 1, "bar": 2})
@@ -255,6 +652,39 @@ class PinvlTestCase(TestCase):
         self.assertEqual(vdr.check(3.14), 3.14)
         self.assertEqual(extract_error(vdr, "bar"), "value does not match any variant")
 
+    def test_Enum_lookup(self):
+        vdr = Enum(1, "foo", [1, 2], None)
+        self.assertIs(vdr.check(True), True)
+        self.assertEqual(vdr.check(1.0), 1.0)
+        self.assertEqual(vdr.check([1, 2]), [1, 2])
+        self.assertIsNone(vdr.check(None))
+        self.assertEqual(extract_error(vdr, [1]), "value does not match any variant")
+        self.assertEqual(extract_error(vdr, {}), "value does not match any variant")
+        self.assertTrue(vdr.is_valid([1, 2]))
+        self.assertFalse(vdr.is_valid({"foo": 1}))
+        self.assertIsNone(vdr._input_values())
+        self.assertEqual(Enum(1, "foo")._input_values(), frozenset([1, "foo"]))
+
+        vdr = Enum("USD", "EUR", 1, ignore_case=True)
+        self.assertEqual(vdr.check("usd"), "USD")
+        self.assertEqual(vdr.check("Eur"), "EUR")
+        self.assertEqual(vdr.check(1), 1)
+        self.assertEqual(extract_error(vdr, "gbp"), "value does not match any variant")
+        self.assertEqual(repr(vdr), "<Enum('USD', 'EUR', 1, ignore_case)>")
+        self.assertEqual((vdr | Null).check("usd"), "USD")
+
+        vdr = Enum.from_iterable(["us ", " ca"], normalize=lambda value: value.strip())
+        self.assertEqual(vdr.check("ca"), " ca")
+        self.assertEqual(vdr.check(" us"), "us ")
+
+        with self.assertRaises(TypeError):
+            Enum("a", ignore_case=True, normalize=str.strip)
+        with self.assertRaises(TypeError):
+            Enum("a", case=True)
+
+        vdr = pickle.loads(pickle.dumps(Enum.from_iterable(range(1000), ignore_case=True)))
+        self.assertEqual(vdr.check(999), 999)
+
     def test_Callable(self):
         vdr = Callable()
         self.assertEqual(vdr.check(map), map)
@@ -289,6 +719,339 @@ class PinvlTestCase(TestCase):
         }
         self.assertNotEqual(extract_error(vdr, data), data)  # too long error
 
+    def test_walk(self):
+        from pinvl.validators import _walk
+
+        def outcome(check, *args):
+            try:
+                return "ok", check(*args)
+            except DataError as err:
+                return "error", err.as_dict()
+            except AttributeError:
+                return "AttributeError", None
+
+        pair = Tuple(Int, Int | Null)
+        cases = [
+            (List(Int, min_length=1, max_length=3), ([], [1, "2"], [1, "x", "y"], [1] * 4, "x")),
+            (List(Int) >> sum, ([1, "2"], [1, "x"])),
+            (pair, ((1, None), [1, "2"], ("x", "y"), 5, (1, ))),
+            (Dict({Key("a", default=1): Int, Key("b", optional=True) >> "c": String, "d": Float}),
+             ({"d": 1}, {"a": "x", "b": 2}, {"b": "x", "d": "y", "e": 1}, [])),
+            (Dict({"a": Int, String: Int, Int: String}),
+             ({"a": 1, "b": "2", 3: "c"}, {"a": 1, "b": "x", 3: 4}, {None: 1, "a": "x"})),
+            (Dict({"a": Int, Any: Any}), ({"a": 1, "b": [], 2: None}, {"b": 1})),
+            (Mapping(String, Int), ({"a": "1"}, {1: "x", "b": 2}, {"a": "x", 2: 2}, 5)),
+            (Or(Int, String) >> str, (1, "a", None)),
+            (Or(Null, Int, adaptive=True), (None, "1", "x", 2)),
+            (List(Dict(a=Mapping(String, pair), b=List(pair) | Null)),
+             ([{"a": {"x": (1, None)}, "b": None}, {"a": {"y": ("z", 1)}, "b": [(1, 2), "q"]}], )),
+        ]
+
+        for vdr, values in cases:
+            for value in values:
+                for fail_fast in (False, True):
+                    self.assertEqual(outcome(_walk, vdr, value, fail_fast, None),
+                                     outcome(vdr.check, value, fail_fast), (vdr, value, fail_fast))
+
+    def test_Forward_deep(self):
+        node = Forward()
+        node << Dict(name=String, children=List(node))
+
+        data = leaf = {"name": "root", "children": []}
+        for _ in range(10000):
+            child = {"name": "child", "children": []}
+            leaf["children"].append(child)
+            leaf = child
+
+        for fail_fast in (False, True):
+            result = node.check(data, fail_fast)
+            for _ in range(10000):
+                result = result["children"][0]
+            self.assertEqual(result, {"name": "child", "children": []})
+
+        leaf["name"] = 1
+        with self.assertRaises(DataError) as context:
+            node.check(data)
+        error = context.exception.as_dict()
+        for _ in range(10000):
+            error = error["children"][0]
+        self.assertEqual(error, {"name": "value is not a string"})
+
+        limited = Forward(max_depth=3)
+        limited << Dict(name=String, children=List(limited))
+        self.assertEqual(
+            extract_error(limited, data),
+            {"children": {0: {"children": "value is nested deeper than 3"}}},
+        )
+        self.assertEqual(limited.check({"name": "root", "children": []}), {"name": "root", "children": []})
+        self.assertFalse(limited.is_valid(data))
+        self.assertTrue(limited.is_valid({"name": "root", "children": []}))
+        self.assertCompiled(limited, data, {"name": "root", "children": []})
+
+        value = 1
+        for _ in range(5000):
+            value = {"a": value}
+
+        for make in (lambda node: Dict({String: node}), lambda node: Mapping(String, node)):
+            node = Forward()
+            node << (Int | make(node))
+            result = node.check(value)
+            for _ in range(5000):
+                result = result["a"]
+            self.assertEqual(result, 1)
+
+        node = Forward()
+        node << (Int | Cached(Mapping(String, node)))  # not walked
+        self.assertRaises(RecursionError, node.check, value)
+
+    def test_fail_fast(self):
+        vdr = List(Dict(name=String, email=String(regex=r".+@.+")))
+        value = [{"name": "foo", "email": "foo@bar"}, {"name": 1, "email": "spam"}, {"name": 2}]
+        self.assertEqual(extract_error(vdr, value), {
+            1: {"name": "value is not a string", "email": "value does not match pattern"},
+            2: {"name": "value is not a string", "email": "is required"},
+        })
+
+        err = catch_error(vdr, value, fail_fast=True)
+        self.assertEqual(err.as_dict(), {1: {"name": "value is not a string"}})
+        self.assertEqual(vdr.check(value[:1], fail_fast=True), value[:1])
+
+        vdr = Mapping(String, Tuple(Int, Int))
+        err = catch_error(vdr, {"foo": (1, "a"), "bar": (1, 2)}, fail_fast=True)
+        self.assertEqual(err.as_dict(), {"foo": {"value": {1: "value cannot be converted to int"}}})
+
+        check = compiler.compile(List(Dict(name=String, email=String(regex=r".+@.+"))), fail_fast=True)
+        self.assertRaises(DataError, check, value)
+
+        try:
+            check(value)
+        except DataError as err:
+            self.assertEqual(err.as_dict(), {1: {"name": "value is not a string"}})
+
+    def test_legacy_check_signature(self):
+        class Upper(String):
+            def check(self, value):
+                return String.check(self, value).upper()
+
+        node = Forward()
+        node << (Upper | List(node))
+        vdr = Dict({"a": List(Upper), "b": Tuple(Upper), "c": Mapping(Upper, Upper), "d": node,
+                    "e": Cached(Upper), String: Upper})
+        value = {"a": ["x"], "b": ["y"], "c": {"k": "v"}, "d": [["z"]], "e": "w", "f": "u"}
+        self.assertEqual(vdr.check(value), {"a": ["X"], "b": ("Y", ), "c": {"K": "V"}, "d": [["Z"]],
+                                            "e": "W", "f": "U"})
+
+    def test_is_valid(self):
+        node = Forward()
+        node << Dict(name=String, children=List[node])
+        validators = [
+            Int, Float > 1, Int[0:10], Bool(convert=True), Null, String, String(regex=r"\d+"),
+            Atom("a"), Enum("a", 1), Type(int), List[Int, 1:2], Tuple(Int, String), Int | Null,
+            Dict({Key("a", optional=True): Int, Key("b", default=1): Int}),
+            Dict({String: Int, Key("x"): Null}), node,
+            Int >> (lambda v: v if v < 5 else Int().check("spam")),
+        ]
+        values = [
+            0, 7, 11, 1.5, "1", "2.0", "abc", "", True, "y", None, [1], [1, "x"], (1, "a"),
+            {"a": 1}, {"a": "x"}, {"x": None, "k": 1}, {"x": None, "k": "q"},
+            {"name": "a", "children": [{"name": 1, "children": []}]},
+        ]
+
+        for vdr in validators:
+            vdr = vdr() if isinstance(vdr, type) else vdr
+
+            for value in values:
+                self.assertEqual(vdr.is_valid(value), not isinstance(catch_error(vdr, value), DataError),
+                                 (vdr, value))
+
+        self.assertTrue(Mapping(String, Int).is_valid({"foo": 1}))
+        self.assertFalse(Mapping(String, Int).is_valid({"foo": "bar"}))
+
+    def test_is_valid_subclass(self):
+        class Digits(String):
+            def _check(self, value):
+                value = super(Digits, self)._check(value)
+
+                if not value.isdigit():
+                    raise DataError("not digits")
+
+                return value
+
+        self.assertFalse(Digits().is_valid("abc"))
+        self.assertTrue(Digits().is_valid("123"))
+
+    def test_DataError(self):
+        err = catch_error(Int(gte=5), 3)
+        self.assertEqual(err.code, "gte")
+        self.assertEqual(err.params, (5, ))
+        self.assertEqual(err.error, "value is less than 5")
+        self.assertEqual(str(err), "value is less than 5")
+
+        err = DataError("custom message")
+        self.assertEqual(err.code, None)
+        self.assertEqual(err.as_dict(), "custom message")
+
+        err = catch_error(Int | Null, "foo")
+        self.assertEqual(err.code, "variants")
+        self.assertEqual(err.as_dict(), {"<Int>": "value cannot be converted to int",
+                                         "<Null>": "value should be None"})
+
+    def assertBatch(self, vdr, value, result, errors):
+        checked, failed = vdr.check_batch(value)
+        self.assertEqual(list(checked), result)
+        self.assertEqual(dict((k, v.as_dict()) for k, v in failed.items()), errors)
+        return checked
+
+    def test_List_check_batch(self):
+        vdr = List(Int[0:10], max_length=4)
+        self.assertBatch(vdr, [1, "2", 30, "a"], [1, 2],
+                         {2: "value is greater than 10", 3: "value cannot be converted to int"})
+        self.assertBatch(vdr, (1, 2), [1, 2], {})
+        self.assertBatch(List(String), ["a", 1], ["a"], {1: "value is not a string"})
+
+        with self.assertRaises(DataError) as cm:
+            vdr.check_batch([1] * 5)
+
+        self.assertEqual(cm.exception.as_dict(), "list length is greater than 4")
+
+        with self.assertRaises(DataError) as cm:
+            vdr.check_batch({})
+
+        self.assertEqual(cm.exception.as_dict(), "value is not list")
+
+    def test_List_check_batch_records(self):
+        vdr = Dict(ts=Int, value=Float[0:], host=String)
+        rows = [{"ts": 1, "value": 0.5, "host": "a"},
+                {"ts": "x", "value": -1, "host": "b"},
+                {"ts": 2},
+                None,
+                {"ts": 3, "value": 1, "host": "c", "extra": 1},
+                {"ts": "4", "value": "2", "host": "d"}]
+        expected = dict((index, extract_error(vdr, row)) for index, row in enumerate(rows)
+                        if not vdr.is_valid(row))
+        self.assertEqual(sorted(expected), [1, 2, 3, 4])
+        self.assertBatch(List(vdr), rows, [vdr.check(rows[0]), vdr.check(rows[5])], expected)
+
+        vdr = List(Dict({Key("a") >> "b": Dict(c=Int[0:5])}))
+        self.assertBatch(vdr, [{"a": {"c": 1}}, {"a": {"c": 9}}], [{"b": {"c": 1}}],
+                         {1: {"b": {"c": "value is greater than 5"}}})
+
+    def test_Dict_check_columns(self):
+        vdr = Dict({Key("tag", default="x") >> "label": String}, ts=Int, value=Float, host=String)
+        result, errors = vdr.check_columns({"ts": [1, "2", "x"], "value": (1, 2, 3), "host": ["a", "b", "c"]})
+        self.assertEqual(result, {"ts": [1, 2], "value": [1.0, 2.0], "host": ["a", "b"], "label": ["x", "x"]})
+        self.assertEqual(dict((k, v.as_dict()) for k, v in errors.items()),
+                         {2: {"ts": "value cannot be converted to int"}})
+
+        result, errors = vdr.check_columns({"ts": [1], "value": [1]})
+        self.assertEqual(result, {})
+        self.assertEqual(errors[0].as_dict(), {"host": "is required"})
+
+        with self.assertRaises(DataError) as cm:
+            vdr.check_columns({"ts": [1], "value": [1, 2]})
+
+        self.assertEqual(cm.exception.as_dict(), {"value": "column length differs from 'ts' column"})
+
+    def test_List_iter_check(self):
+        vdr = List(Int, min_length=2, max_length=3)
+        result = list(vdr.iter_check(str(i) for i in range(3)))
+        self.assertEqual(result, [(0, 0), (1, 1), (2, 2)])
+
+        result = list(vdr.iter_check(iter([1, "a"])))
+        self.assertEqual(result[0], (0, 1))
+        self.assertEqual(result[1][0], 1)
+        self.assertEqual(result[1][1].as_dict(), "value cannot be converted to int")
+
+        items = vdr.iter_check(iter(range(10)))
+        self.assertEqual([next(items) for _ in range(3)], [(0, 0), (1, 1), (2, 2)])
+
+        with self.assertRaises(DataError) as cm:
+            next(items)
+
+        self.assertEqual(cm.exception.as_dict(), "list length is greater than 3")
+
+        for value, error in (([1], "list length is less than 2"),
+                             (1, "value is not list"),
+                             ("12", "value is not list")):
+            with self.assertRaises(DataError) as cm:
+                list(vdr.iter_check(value))
+
+            self.assertEqual(cm.exception.as_dict(), error)
+
+    def test_check_json(self):
+        node = Forward()
+        node << Dict(name=String, children=List(node, max_length=2))
+        vdr = Dict({Key("id") >> "pk": Int, Key("tags", default=list): List(String) >> tuple}, node=node)
+
+        doc = '{"id": "5", "node": {"name": "a", "children": [{"name": "b", "children": []}]}}'
+        expected = vdr.check(json.loads(doc))
+        self.assertEqual(check_json(vdr, doc), expected)
+        self.assertEqual(check_json(vdr, io.BytesIO(doc.encode("utf-8")), chunk_size=3), expected)
+        self.assertEqual(check_json(vdr, iter(doc)), expected)
+
+        def chunks(*parts):
+            for part in parts:
+                yield part
+
+            raise AssertionError("rejected document is read to the end")
+
+        for parts, error in (
+                (('{"id": 1, "extra": ', ), {"extra": "'extra' is not allowed key"}),
+                (('{"id": "x"', ), {"pk": "value cannot be converted to int"}),
+                (('{"id": 1, "node": {"name": "a", "children": [1, ', ), {"node": {"children": {0: "value is not dict"}}}),
+                (('{"id": 1, "node": {"name": "a", "children": [{"name": "b", "children": []}, ',
+                  '{"name": "c", "children": []}, ', ), {"node": {"children": "list length is greater than 2"}}),
+                (('{"id": 1, "tags": "a"', ), {"tags": "value is not list"})):
+            with self.assertRaises(DataError) as cm:
+                check_json(vdr, chunks(*parts))
+
+            self.assertEqual(cm.exception.as_dict(), error)
+
+        with self.assertRaises(DataError) as cm:
+            check_json(vdr, '{"id": 1}')
+
+        self.assertEqual(cm.exception.as_dict(), {"node": "is required"})
+        self.assertEqual(check_json(Dict({String: Float}), '{"a": 1.5, "b": -2e1}'), {"a": 1.5, "b": -20.0})
+        self.assertEqual(check_json(List(Any), ' [true, false, null, "\\u00e9"] '), [True, False, None, u"\u00e9"])
+
+        for doc in ('{"a": 1', '[1,]', '[1.]', 'tru', '[1] x', '', '"abc', '[NaN]', '{"a": -Infinity}'):
+            self.assertRaises(JSONError, check_json, Any, doc)
+
+        doc = json.dumps({"a": "x" * 100000 + '"\\', "b": "\\"})
+        self.assertEqual(check_json(Dict(a=String, b=String), io.StringIO(doc), chunk_size=7), json.loads(doc))
+
+        for doc in ("[" * 100000 + "]" * 100000, "[" + "1" * 5000 + "]", '"\\'):
+            self.assertRaises(JSONError, check_json, Any, io.StringIO(doc))
+
+    @skipIf(numpy is None, "numpy is not installed")
+    def test_List_check_batch_numpy(self):
+        result = self.assertBatch(List(Int[0:100]), numpy.array([1.0, 2.5, 300, numpy.nan, 50]), [1, 50],
+                                  {1: "value is not int", 2: "value is greater than 100",
+                                   3: "value is not int"})
+        self.assertIsInstance(result, numpy.ndarray)
+
+        result = self.assertBatch(List(Float(gt=0)), numpy.array([1, 2, 0]), [1.0, 2.0],
+                                  {2: "value should be greater than 0"})
+        self.assertEqual(result.dtype, numpy.float64)
+
+        result = self.assertBatch(List(Float(lt=1)), [0.5, 2, 0], [0.5, 0.0],
+                                  {1: "value should be less than 1"})
+        self.assertIsInstance(result, list)
+
+        self.assertBatch(List(Int), [2 ** 70, 1.0], [2 ** 70, 1], {})
+        self.assertBatch(List(Int), numpy.array([1e30]), [int(1e30)], {})
+        self.assertBatch(List(Int), numpy.array([2 ** 63, 1], dtype=numpy.uint64), [2 ** 63, 1], {})
+        result, errors = List(Int).check_batch([True, 2])
+        self.assertEqual(result, [True, 2])
+        self.assertIs(result[0], True)
+        self.assertBatch(List(Int(strict=True)), [1, True, 2.0], [1], {1: "value is not int", 2: "value is not int"})
+
+        result, errors = Dict(ts=Int, value=Float[0:1]).check_columns(
+            {"ts": numpy.arange(4), "value": numpy.array([0.5, 2, 0, 1])})
+        self.assertEqual(result["ts"].tolist(), [0, 2, 3])
+        self.assertEqual(result["value"].tolist(), [0.5, 0.0, 1.0])
+        self.assertEqual(errors[1].as_dict(), {"value": "value is greater than 1"})
+
     def test_Or(self):
         vdr = Int | Float
         self.assertEqual(vdr.check(3), 3)
@@ -300,6 +1063,112 @@ class PinvlTestCase(TestCase):
         vdr = List(Int) >> sum
         self.assertEqual(vdr.check([1, 2, 3]), 6)
 
+    def test_Or_dispatch(self):
+        calls = []
+
+        class Spy(Int):
+            def _check(self, value):
+                calls.append(value)
+                return super(Spy, self)._check(value)
+
+        vdr = Null | String | Spy | Dict(a=Int) | List(Int)
+        self.assertEqual(vdr._candidates({}), (2, 3))
+        self.assertEqual(vdr.check({"a": "1"}), {"a": 1})
+        self.assertEqual(vdr.check([1]), [1])
+        self.assertEqual(vdr.check(None), None)
+        self.assertEqual(vdr.check("1"), "1")
+        self.assertEqual(calls, [{"a": "1"}, [1]])  # type of Spy is unknown
+        self.assertEqual(list(extract_error(vdr, 1.5)),
+                         ["<Null>", "<String>", "<Spy>", "<Dict(a=<Int>)>", "<List(<Int>)>"])
+        self.assertTrue(vdr.is_valid([1]))
+        self.assertFalse(vdr.is_valid(1.5))
+
+    def test_Or_adaptive(self):
+        vdr = Or(Dict(v=Atom(1)), Dict(v=Atom(2)), Dict(v=Atom(3)), adaptive=True)
+        vdr._ranking.period = vdr._ranking.countdown = 3
+
+        for _ in range(3):
+            self.assertEqual(vdr.check({"v": 3}), {"v": 3})
+
+        self.assertEqual(vdr._ranking.order, (2, 0, 1))
+        self.assertEqual(extract_error(vdr, {"v": 4}), extract_error(Or(*vdr.validators), {"v": 4}))
+        self.assertEqual(vdr.check({"v": 1}), {"v": 1})
+        self.assertFalse(vdr.is_valid({"v": 4}))
+        self.assertEqual(compiler.compile(vdr)({"v": 2}), {"v": 2})
+
+        vdr = Or(String, Int, adaptive=True)
+        vdr._ranking.period = vdr._ranking.countdown = 1
+        vdr.check(1)
+        self.assertEqual(list(extract_error(vdr, None)), ["<String>", "<Int>"])
+        self.assertIsNotNone((vdr | Null)._ranking)
+        self.assertRaises(TypeError, Or, Int, adapt=True)
+
+    def assertCompiled(self, vdr, *values):
+        check = compiler.compile(vdr)
+
+        for value in values:
+            expected = extract_error(vdr, value)
+
+            try:
+                result = check(value)
+            except DataError as err:
+                result = err.as_dict()
+
+            self.assertEqual(result, expected)
+
+    def test_compile(self):
+        self.assertCompiled(Dict(foo=Int[1:], bar=List[String]),
+                            {"foo": 1, "bar": ["spam"]}, {"foo": 0, "bar": [1]},
+                            {"foo": "3", "bar": [], "baz": 1}, {}, "foo")
+        self.assertCompiled(Int | Float | Null, 1, "2", 2.5, None, "foo")
+        self.assertCompiled(Tuple(Int, String(regex=r"\d+")), (1, "23"), [1, "a"], 5, (1, ))
+        self.assertCompiled(Mapping(String, Int >> (lambda v: v * 2)), {"foo": 1}, {1: "foo"})
+        self.assertCompiled(Enum("foo", 1), "foo", 1, 2)
+        self.assertCompiled(Enum("USD", [1], ignore_case=True), "usd", [1], "gbp", {})
+        self.assertCompiled(Float[0:1] > 0, 0, 0.5, "0.5", 2)
+        self.assertCompiled(Int(strict=True), 1, True, "1", 1.0)
+
+    def test_compile_Dict_keys(self):
+        vdr = Dict({
+            Key("foo", default=lambda: 3) >> "bar": Int,
+            Key("spam", optional=True): Bool(convert=True),
+        })
+        self.assertCompiled(vdr, {"foo": 1}, {}, {"spam": "y"}, {"spam": "eggs", "foo": "x", "baz": 1})
+
+        vdr = Dict({Key("foo"): Atom("bar"), String: Int})
+        self.assertCompiled(vdr, {"foo": "bar", "baz": 1}, {"foo": "bar", "baz": "spam"})
+
+    def test_compile_Forward(self):
+        node = Forward()
+        node << Dict(name=String, children=List[node])
+        self.assertCompiled(node, {"name": "foo", "children": [{"name": "bar", "children": []}]},
+                            {"name": "foo", "children": [1]})
+
+    def test_compile_traceback(self):
+        import traceback
+
+        def fail(value):
+            raise ValueError(value)
+
+        check = compiler.compile(Call(fail))
+        compiler.compile(String)
+
+        try:
+            check(1)
+        except ValueError:
+            lines = traceback.format_exc()
+
+        self.assertIn(check.__code__.co_filename, lines)
+        self.assertNotIn("string_types", lines)
+
+    def test_compile_deep(self):
+        vdr = Int
+
+        for i in range(30):
+            vdr = List(vdr) if i % 2 else Or(Null, vdr)
+
+        self.assertCompiled(vdr, None, [None], 5)
+
 
 if __name__ == "__main__":
     main()